@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the changelog pipeline
+
+Each benchmark builds a synthetic payload sized like a large monorepo
+range and compares the current code path against the old one. Memory is
+measured as peak RSS of a fresh child process per variant, so one
+variant's allocations can't skew the other's.
+
+Usage:
+    python3 benchmarks.py json-stream --files 10000
+    python3 benchmarks.py path-rules --paths 50000
+    python3 benchmarks.py changelog --commits 10000
+    python3 benchmarks.py snapshot --commits 10000
+"""
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def peak_rss_mb() -> float:
+    # VmHWM resets on exec; ru_maxrss can carry over the forking parent's peak
+    status = Path('/proc/self/status')
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    # ru_maxrss is bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 / 1024
+
+
+def run_child(*args: str) -> dict:
+    """Run this script as `_child <args>` and return the JSON it prints"""
+    result = subprocess.run([sys.executable, __file__, '_child', *args], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def print_results(title: str, results: dict):
+    print(f"\n📊 {title}")
+    for name, result in results.items():
+        print(f"   {name:<14} {result['seconds'] * 1000:>9.1f} ms   peak RSS {result['peak_rss_mb']:>8.1f} MB")
+
+
+# ---------------------------------------------------------------------------
+# json-stream: response.json() vs iter_json_object over a compare payload
+# ---------------------------------------------------------------------------
+
+def make_compare_payload(path: Path, files: int, commits: int = 250, patch_lines: int = 40):
+    random.seed(42)
+    payload = {
+        'total_commits': commits,
+        'merge_base_commit': {'sha': 'b' * 40},
+        'commits': [
+            {'sha': f'{i:040x}', 'commit': {'message': f'LSN-{i} change {i}\n\nDetails ' * 3,
+                                              'author': {'name': f'dev{i % 17}', 'date': '2026-01-20T10:00:00Z'}}}
+            for i in range(commits)
+        ],
+        'files': [],
+    }
+    for i in range(files):
+        patch = ''.join(f"+    val value{j} = compute({j}, \"{random.random():.6f}\")\n" for j in range(patch_lines))
+        payload['files'].append({
+            'filename': f'feature{i % 120}/src/main/java/com/speak/feature/File{i}.kt',
+            'additions': patch_lines, 'deletions': 0, 'changes': patch_lines, 'status': 'modified',
+            'patch': f'@@ -0,0 +1,{patch_lines} @@\n' + patch,
+        })
+    path.write_text(json.dumps(payload))
+
+
+def child_json_stream(variant: str, path: str) -> dict:
+    from json_stream import iter_json_object, STREAM_CHUNK_SIZE
+
+    start = time.perf_counter()
+    commits = files = 0
+    if variant == 'response.json':
+        # What requests does: whole body in memory, then json.loads
+        data = json.loads(Path(path).read_bytes())
+        commits, files = len(data['commits']), len(data['files'])
+    else:
+        with open(path, 'rb') as handle:
+            chunks = iter(lambda: handle.read(STREAM_CHUNK_SIZE), b'')
+            for kind, key, _ in iter_json_object(chunks):
+                if kind == 'item':
+                    commits += key == 'commits'
+                    files += key == 'files'
+    return {'seconds': time.perf_counter() - start, 'peak_rss_mb': peak_rss_mb(), 'commits': commits, 'files': files}
+
+
+def bench_json_stream(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'compare.json'
+        make_compare_payload(path, args.files)
+        size_mb = path.stat().st_size / 1024 / 1024
+        results = {variant: run_child('json-stream', variant, str(path))
+                   for variant in ('response.json', 'streamed')}
+    print_results(f"Compare payload: {args.files} files, {size_mb:.0f} MB", results)
+
+
+# ---------------------------------------------------------------------------
+# path-rules: one compiled matcher vs fnmatch over every glob
+# ---------------------------------------------------------------------------
+
+def make_paths(count: int) -> list:
+    random.seed(42)
+    templates = [
+        'feature{m}/src/main/res/values-{loc}/strings.xml',
+        'feature{m}/src/main/java/com/speak/feature{m}/Screen{i}.kt',
+        'feature{m}/src/test/java/com/speak/feature{m}/Screen{i}Test.kt',
+        'feature{m}/build/generated/source/kapt/debug/Screen{i}_Factory.java',
+        'feature{m}/build.gradle.kts',
+        'ios/Speak/{loc}.lproj/Localizable.strings',
+        'ios/Pods/Lib{m}/Sources/File{i}.swift',
+    ]
+    locales = ['de', 'es', 'fr', 'ja', 'ko', 'pt-rBR', 'zh-rCN']
+    return [random.choice(templates).format(m=i % 80, i=i, loc=random.choice(locales)) for i in range(count)]
+
+
+def child_path_rules(variant: str, count: str) -> dict:
+    from path_rules import PathClassifier, DEFAULT_PATH_RULES, DEFAULT_CLASS
+    paths = make_paths(int(count))
+
+    start = time.perf_counter()
+    classes = {}
+    if variant == 'fnmatch':
+        from fnmatch import fnmatchcase
+
+        def classify(path):
+            for name, globs in DEFAULT_PATH_RULES.items():
+                # fnmatch's `*` crosses directories, and `**/` needs a leading directory
+                if any(fnmatchcase(path, glob) or fnmatchcase(path, glob[3:]) for glob in globs):
+                    return name
+            return DEFAULT_CLASS
+    else:
+        classify = PathClassifier().classify
+    for path in paths:
+        name = classify(path)
+        classes[name] = classes.get(name, 0) + 1
+    return {'seconds': time.perf_counter() - start, 'peak_rss_mb': peak_rss_mb(), 'classes': classes}
+
+
+def bench_path_rules(args):
+    results = {variant: run_child('path-rules', variant, str(args.paths)) for variant in ('fnmatch', 'compiled')}
+    print_results(f"Classifying {args.paths} paths", results)
+    print(f"   classes: {results['compiled']['classes']}")
+
+
+# ---------------------------------------------------------------------------
+# changelog: `changelog += ...` and .format vs chunks written into the prompt
+# ---------------------------------------------------------------------------
+
+def iter_compare_events(commits: int, files: int = 300):
+    yield 'summary', {'total_commits': commits}
+    for i in range(commits):
+        message = f"LSN-{i} Change {i}\n\n" + f"Details of change {i}. " * 12
+        yield 'commit', {'sha': f'{i:040x}', 'commit': {'message': message,
+                                                        'author': {'name': f'dev{i % 17}', 'date': '2026-01-20T10:00:00Z'}}}
+    for i in range(files):
+        yield 'file', {'filename': f'feature{i % 40}/src/main/java/File{i}.kt',
+                       'additions': i % 50, 'deletions': i % 7, 'changes': i % 50 + i % 7}
+
+
+def concatenated_changelog(events) -> str:
+    """The original fetch_changelog_from_github formatting loop"""
+    data = {'commits': [], 'files': []}
+    for kind, item in events:
+        if kind == 'summary':
+            data.update(item)
+        else:
+            data[kind + 's'].append(item)
+    changelog = f"Total commits: {data.get('total_commits', 0)}\n"
+    changelog += f"Files changed: {len(data['files'])}\n\n"
+    changelog += "=== COMMITS ===\n\n"
+    for commit in data['commits']:
+        changelog += f"Commit: {commit['sha'][:7]}\n"
+        changelog += f"Author: {commit['commit']['author']['name']}\n"
+        changelog += f"Date: {commit['commit']['author']['date']}\n"
+        changelog += f"Message: {commit['commit']['message']}\n"
+        changelog += "-" * 50 + "\n\n"
+    changelog += "\n=== FILES CHANGED ===\n\n"
+    for file_info in data['files'][:50]:
+        changelog += f"{file_info['filename']}\n"
+        changelog += f"  +{file_info['additions']} -{file_info['deletions']} (total: {file_info['changes']} changes)\n"
+    return changelog
+
+
+def child_changelog(variant: str, commits: str) -> dict:
+    import contextlib
+    import io
+    from weekly_automation_with_fetch import CLAUDE_PROMPT_TEMPLATE, iter_changelog
+    from changelog_writer import render_prompt
+
+    start = time.perf_counter()
+    events = iter_compare_events(int(commits))
+    if variant == 'concat':
+        prompt = CLAUDE_PROMPT_TEMPLATE.format(changelog_data=concatenated_changelog(events))
+    else:
+        with contextlib.redirect_stdout(io.StringIO()):
+            chunks = list(iter_changelog(events, 'owner', 'repo', 'base', 'head'))
+        prompt = render_prompt(CLAUDE_PROMPT_TEMPLATE, chunks)
+    return {'seconds': time.perf_counter() - start, 'peak_rss_mb': peak_rss_mb(), 'prompt_chars': len(prompt)}
+
+
+def bench_changelog(args):
+    results = {variant: run_child('changelog', variant, str(args.commits)) for variant in ('concat', 'streamed')}
+    print_results(f"Changelog for {args.commits} commits", results)
+
+
+# ---------------------------------------------------------------------------
+# snapshot: loading a saved release, JSON events vs the binary snapshot
+# ---------------------------------------------------------------------------
+
+def child_snapshot(variant: str, path: str) -> dict:
+    from release_model import load_release
+
+    start = time.perf_counter()
+    if variant == 'json':
+        events = json.loads(Path(path).read_text())
+        commits = sum(kind == 'commit' for kind, _ in events)
+    else:
+        commits = len(load_release(Path(path)).commits)
+    return {'seconds': time.perf_counter() - start, 'peak_rss_mb': peak_rss_mb(), 'commits': commits}
+
+
+def bench_snapshot(args):
+    from release_model import Release, save_release
+
+    with tempfile.TemporaryDirectory() as tmp:
+        release = Release('owner', 'repo', 'base', 'head')
+        events = list(release.record(iter_compare_events(args.commits)))
+        json_path, snapshot_path = Path(tmp) / 'events.json', Path(tmp) / 'release.bin'
+        json_path.write_text(json.dumps(events))
+        save_release(release, snapshot_path)
+        sizes = {'json': json_path.stat().st_size, 'snapshot': snapshot_path.stat().st_size}
+        results = {variant: run_child('snapshot', variant, str(path))
+                   for variant, path in (('json', json_path), ('snapshot', snapshot_path))}
+    print_results(f"Loading a {args.commits}-commit release", results)
+    print(f"   on disk: json {sizes['json'] / 1024:.0f} KB, snapshot {sizes['snapshot'] / 1024:.0f} KB")
+
+
+CHILDREN = {
+    'json-stream': child_json_stream,
+    'path-rules': child_path_rules,
+    'changelog': child_changelog,
+    'snapshot': child_snapshot,
+}
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '_child':
+        print(json.dumps(CHILDREN[sys.argv[2]](*sys.argv[3:])))
+        return 0
+
+    parser = argparse.ArgumentParser(description='Changelog pipeline benchmarks')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    json_stream = subparsers.add_parser('json-stream', help='Peak RSS of response.json() vs streamed parsing')
+    json_stream.add_argument('--files', type=int, default=10000)
+    json_stream.set_defaults(run=bench_json_stream)
+
+    path_rules = subparsers.add_parser('path-rules', help='Path classification time, compiled matcher vs fnmatch')
+    path_rules.add_argument('--paths', type=int, default=50000)
+    path_rules.set_defaults(run=bench_path_rules)
+
+    changelog = subparsers.add_parser('changelog', help='Changelog + prompt assembly, concatenation vs streamed chunks')
+    changelog.add_argument('--commits', type=int, default=10000)
+    changelog.set_defaults(run=bench_changelog)
+
+    snapshot = subparsers.add_parser('snapshot', help='Release load time, JSON events vs binary snapshot')
+    snapshot.add_argument('--commits', type=int, default=10000)
+    snapshot.set_defaults(run=bench_snapshot)
+
+    args = parser.parse_args()
+    args.run(args)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
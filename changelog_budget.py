@@ -0,0 +1,135 @@
+"""
+Token-budget compaction of the changelog
+
+A fixed 50-file cut wastes context on small RCs and still overflows it on
+huge ones. Given a token budget, the commit and file listings are fitted
+into whatever the fixed sections (header, module table, patches) leave,
+degrading in stages and stopping as soon as everything fits:
+
+1. drop low-signal entries: merge commits, version bumps, locale files
+2. list only as many files as fit, leaving the rest to the per-module
+   churn table
+3. trim commit message bodies to the longest length that fits, down to
+   the bare subject line
+4. drop the trailing commits that still don't fit
+
+Each stage records what it elided so the prompt can say so.
+"""
+
+import re
+
+from patch_sampler import CHARS_PER_TOKEN
+from path_rules import PathClassifier
+
+
+DEFAULT_CHANGELOG_BUDGET_TOKENS = 24000
+MAX_SUBJECT_CHARS = 120
+
+MERGE_COMMIT = re.compile(r'^Merge (pull request|branch|remote-tracking branch|tag) ')
+VERSION_BUMP = re.compile(r'^(chore[:(].*)?\b(bump(ed)? (app )?version|version ?(code|name)? bump|'
+                          r'(set|update) version( code| name)? to)\b', re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def subject_line(message: str) -> str:
+    subject = message.split('\n', 1)[0]
+    return subject if len(subject) <= MAX_SUBJECT_CHARS else subject[:MAX_SUBJECT_CHARS - 1] + '…'
+
+
+def truncate_message(message: str, body_chars: int) -> str:
+    """Subject line plus at most `body_chars` of the body"""
+    subject, _, body = message.partition('\n')
+    body = body.strip()
+    if not body_chars or not body:
+        return subject_line(message)
+    if len(body) <= body_chars:
+        return message
+    return f"{subject}\n\n{body[:body_chars]}…"
+
+
+def compact_changelog(commits: list, files: list, render_commit, render_file,
+                      budget_tokens: int, fixed_tokens: int = 0, classifier: PathClassifier = None):
+    """Fit commit and file entries into `budget_tokens` minus the fixed sections
+
+    `commits` are (sha, author, date, message, ...) tuples rendered by
+    `render_commit(commit, message)`; `files` are GitHub-shaped file dicts
+    rendered by `render_file(file)`. Returns (commit_lines, file_lines,
+    elided) where `elided` lists human-readable notes of what was dropped.
+    Locale files are those `classifier` (default rules if None) puts in
+    the 'locale' class.
+    """
+    classifier = classifier or PathClassifier()
+    budget_chars = max(budget_tokens - fixed_tokens, 0) * CHARS_PER_TOKEN
+    messages = [commit[3] for commit in commits]
+    elided = []
+
+    def commit_blocks():
+        return [render_commit(commit, message) for commit, message in zip(commits, messages)]
+
+    def size():
+        return sum(map(len, commit_blocks())) + sum(len(render_file(f)) for f in files)
+
+    if size() <= budget_chars:
+        return commit_blocks(), [render_file(f) for f in files], elided
+
+    # 1. Low-signal entries
+    merges = {i for i, commit in enumerate(commits) if MERGE_COMMIT.match(commit[3])}
+    bumps = {i for i, commit in enumerate(commits) if i not in merges and VERSION_BUMP.search(subject_line(commit[3]))}
+    dropped = merges | bumps
+    commits = [commit for i, commit in enumerate(commits) if i not in dropped]
+    messages = [message for i, message in enumerate(messages) if i not in dropped]
+    locale_files = [f for f in files if classifier.classify(f['filename']) == 'locale']
+    files = [f for f in files if classifier.classify(f['filename']) != 'locale']
+    if merges:
+        elided.append(f"{len(merges)} merge commits")
+    if bumps:
+        elided.append(f"{len(bumps)} version-bump commits")
+    if locale_files:
+        elided.append(f"{len(locale_files)} locale files")
+    if size() <= budget_chars:
+        return commit_blocks(), [render_file(f) for f in files], elided
+
+    # 2. As many files as fit next to the commits; the churn table covers the rest
+    blocks = commit_blocks()
+    room = budget_chars - sum(map(len, blocks))
+    file_blocks = []
+    for f in files:
+        block = render_file(f)
+        if len(block) > room:
+            break
+        file_blocks.append(block)
+        room -= len(block)
+    if len(file_blocks) < len(files):
+        elided.append(f"{len(files) - len(file_blocks)} of {len(files)} listed files (see CHURN BY MODULE)")
+    if room >= 0:
+        return blocks, file_blocks, elided
+
+    # 3. Longest message bodies that fit
+    full_messages = messages
+    low, high = 0, max(map(len, full_messages), default=0)
+    while low < high:
+        body_chars = (low + high + 1) // 2
+        messages = [truncate_message(message, body_chars) for message in full_messages]
+        if sum(map(len, commit_blocks())) <= budget_chars:
+            low = body_chars
+        else:
+            high = body_chars - 1
+    messages = [truncate_message(message, low) for message in full_messages]
+    shortened = sum(message != full for message, full in zip(messages, full_messages))
+    if shortened:
+        elided.append(f"parts of {shortened} commit messages" + (f" (bodies trimmed to {low} chars)" if low else ""))
+
+    # 4. Whatever still fits, in order
+    blocks = []
+    used = 0
+    for block in commit_blocks():
+        if used + len(block) > budget_chars:
+            break
+        blocks.append(block)
+        used += len(block)
+    if len(blocks) < len(commits):
+        elided.append(f"the last {len(commits) - len(blocks)} commits")
+    return blocks, [], elided
@@ -0,0 +1,34 @@
+"""
+Streaming changelog output
+
+The changelog used to be built with `changelog += ...` for every commit
+and file, then copied again by `CLAUDE_PROMPT_TEMPLATE.format`. Sources
+now produce the changelog as a sequence of chunks, and the prompt is
+written chunk by chunk into one buffer, so the text exists once: in the
+final prompt.
+"""
+
+import io
+
+
+PLACEHOLDER = '{changelog_data}'
+
+
+def write_chunks(chunks, out) -> int:
+    """Write changelog chunks to a text buffer or file, returning the characters written"""
+    written = 0
+    for chunk in chunks:
+        written += out.write(chunk)
+    return written
+
+
+def render_prompt(template: str, chunks) -> str:
+    """Equivalent of template.format(changelog_data=''.join(chunks)) without the intermediate string"""
+    if isinstance(chunks, str):
+        chunks = (chunks,)
+    before, after = template.split(PLACEHOLDER, 1)
+    out = io.StringIO()
+    out.write(before.replace('{{', '{').replace('}}', '}'))
+    write_chunks(chunks, out)
+    out.write(after.replace('{{', '{').replace('}}', '}'))
+    return out.getvalue()
@@ -0,0 +1,120 @@
+"""
+Churn rollup by module
+
+The changelog lists at most 50 files, which says little about where a
+release's change volume actually is. Every changed path is inserted into
+a prefix trie that keeps file counts and +/- totals at each directory,
+then rolled up to Gradle modules (a directory holding `src/` or a
+build.gradle) or, outside modules, to a fixed directory depth.
+"""
+
+import html
+
+
+DEFAULT_ROLLUP_DEPTH = 2
+MAX_ROLLUP_ROWS = 25
+BUILD_FILES = ('build.gradle', 'build.gradle.kts')
+
+
+class _Node:
+    __slots__ = ('children', 'files', 'additions', 'deletions', 'has_build_file')
+
+    def __init__(self):
+        self.children = {}
+        self.files = 0
+        self.additions = 0
+        self.deletions = 0
+        self.has_build_file = False
+
+
+class PathTrie:
+    """Prefix trie over path components with churn totals at every directory"""
+
+    def __init__(self, max_depth: int = DEFAULT_ROLLUP_DEPTH):
+        self.root = _Node()
+        self.max_depth = max_depth
+
+    def insert(self, path: str, additions: int, deletions: int):
+        *directories, filename = path.split('/')
+        node = self.root
+        for part in [None] + directories:
+            if part is not None:
+                node = node.children.setdefault(part, _Node())
+            node.files += 1
+            node.additions += additions
+            node.deletions += deletions
+        if filename in BUILD_FILES:
+            node.has_build_file = True
+
+    def rollup(self) -> list:
+        """Rows of {'module', 'files', 'additions', 'deletions'}, highest churn first"""
+        rows = []
+        self._walk(self.root, '', 0, rows)
+        rows.sort(key=lambda row: row['additions'] + row['deletions'], reverse=True)
+        return rows
+
+    def module_of(self, path: str) -> str:
+        """The rollup row an inserted path belongs to"""
+        node = self.root
+        prefix = []
+        for part in path.split('/')[:-1]:
+            if part not in node.children:
+                break
+            node = node.children[part]
+            prefix.append(part)
+            if node.has_build_file or 'src' in node.children or len(prefix) >= self.max_depth or not node.children:
+                break
+        return '/'.join(prefix) or '(root)'
+
+    def _walk(self, node: _Node, prefix: str, depth: int, rows: list):
+        is_module = node.has_build_file or 'src' in node.children
+        if depth and (is_module or depth >= self.max_depth or not node.children):
+            rows.append(_row(prefix, node.files, node.additions, node.deletions))
+            return
+
+        # Files sitting directly in this directory, outside any child
+        files = node.files - sum(child.files for child in node.children.values())
+        if files:
+            additions = node.additions - sum(child.additions for child in node.children.values())
+            deletions = node.deletions - sum(child.deletions for child in node.children.values())
+            rows.append(_row(prefix or '(root)', files, additions, deletions))
+        for name, child in node.children.items():
+            self._walk(child, f"{prefix}/{name}" if prefix else name, depth + 1, rows)
+
+
+def _row(module: str, files: int, additions: int, deletions: int) -> dict:
+    return {'module': module, 'files': files, 'additions': additions, 'deletions': deletions}
+
+
+def _split_rows(rows: list, limit: int):
+    shown, rest = rows[:limit], rows[limit:]
+    if rest:
+        shown = shown + [_row(f"({len(rest)} more)", sum(r['files'] for r in rest),
+                              sum(r['additions'] for r in rest), sum(r['deletions'] for r in rest))]
+    return shown
+
+
+def render_churn_table(rows: list, limit: int = MAX_ROLLUP_ROWS) -> str:
+    """Plain-text "churn by module" table for the changelog"""
+    if not rows:
+        return ''
+    shown = _split_rows(rows, limit)
+    width = max(len(row['module']) for row in shown)
+    lines = ["\n=== CHURN BY MODULE (all files) ===\n\n"]
+    for row in shown:
+        lines.append(f"{row['module']:<{width}}  {row['files']:>5} files  +{row['additions']} -{row['deletions']}\n")
+    return ''.join(lines)
+
+
+def render_churn_html(rows: list, limit: int = MAX_ROLLUP_ROWS) -> str:
+    """Report-page table of the same rollup"""
+    cells = ''.join(
+        f'''
+                <tr><td>{html.escape(row['module'])}</td><td>{row['files']}</td>'''
+        f'''<td>+{row['additions']}</td><td>-{row['deletions']}</td></tr>'''
+        for row in _split_rows(rows, limit)
+    )
+    return f'''
+            <table style="width: 100%; font-size: 12px; border-collapse: collapse;">
+                <tr style="text-align: left; color: #787774;"><th>Module</th><th>Files</th><th>Added</th><th>Deleted</th></tr>{cells}
+            </table>'''
@@ -0,0 +1,188 @@
+"""
+Co-change coupling from local git history
+
+Many regressions come from changing a file without the partner it is
+usually changed with. This counts, over the repository's history, how
+often each pair of files changed in the same commit, and flags changed
+files whose strongly coupled partners were left untouched in a release.
+
+The matrix is sparse (an adjacency dict of pair counts) and is updated
+incrementally: each run only reads the commits not reachable from the
+heads already processed. On disk it is three parallel `array` columns
+(left file, right file, count) plus per-file commit counts, saved with
+marshal and zlib like the other caches. Needs a local clone or mirror.
+"""
+
+import html
+import marshal
+import sys
+import zlib
+from array import array
+from pathlib import Path
+
+from local_git import run_git, resolve_ref
+
+
+DEFAULT_COCHANGE_DIR = '.cache/cochange'
+
+# Commits touching more files than this are bulk edits (renames, version
+# bumps, formatting) that say nothing about real coupling
+MAX_FILES_PER_COMMIT = 40
+MIN_SHARED_COMMITS = 3
+MIN_CONFIDENCE = 0.5
+MAX_TIPS_REMEMBERED = 20
+MAX_MISSING_LISTED = 40
+
+_HEADER = b'RDCC' + bytes([1, *sys.version_info[:2]])
+
+
+class CoChangeMatrix:
+    """Per-file commit counts and sparse per-pair co-change counts for one repository"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.names = []
+        self.index = {}
+        self.commits = array('l')
+        self.pairs = {}
+        self.tips = []
+        try:
+            data = self.path.read_bytes()
+        except OSError:
+            return
+        if data[:len(_HEADER)] != _HEADER:
+            return
+        self.tips, self.names, commits, left, right, counts = marshal.loads(zlib.decompress(data[len(_HEADER):]))
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.commits.frombytes(commits)
+        columns = [array('l'), array('l'), array('l')]
+        for column, raw in zip(columns, (left, right, counts)):
+            column.frombytes(raw)
+        for i, j, count in zip(*columns):
+            self.pairs.setdefault(i, {})[j] = count
+            self.pairs.setdefault(j, {})[i] = count
+
+    @classmethod
+    def for_repo(cls, root: str, owner: str, repo: str):
+        return cls(Path(root) / owner / f"{repo}.bin")
+
+    def _slot(self, name: str) -> int:
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.names)
+            self.names.append(name)
+            self.commits.append(0)
+        return i
+
+    def add_commit(self, filenames: list):
+        """Count one commit's files and every pair among them"""
+        slots = sorted({self._slot(name) for name in filenames})
+        for i in slots:
+            self.commits[i] += 1
+        for a, i in enumerate(slots):
+            row = self.pairs.setdefault(i, {})
+            for j in slots[a + 1:]:
+                row[j] = row.get(j, 0) + 1
+                self.pairs.setdefault(j, {})[i] = row[j]
+
+    def update_from_git(self, repo_path: str, head: str) -> int:
+        """Add the commits reachable from head but not from any head already processed"""
+        head_sha = resolve_ref(repo_path, head)
+        if head_sha in self.tips:
+            return 0
+        # -z keeps non-ASCII paths unquoted, matching the compare and numstat filenames
+        log = run_git(repo_path, 'log', '-z', '--no-merges', '--name-only', '--format=%x1e', head_sha,
+                      '--not', *self.tips, '--')
+        added = 0
+        for record in log.split('\x1e'):
+            filenames = [name.lstrip('\n') for name in record.split('\x00') if name.strip('\n')]
+            if len(filenames) <= MAX_FILES_PER_COMMIT:
+                self.add_commit(filenames)
+            added += bool(filenames)
+        self.tips = (self.tips + [head_sha])[-MAX_TIPS_REMEMBERED:]
+        return added
+
+    def partners(self, filename: str, min_shared: int = MIN_SHARED_COMMITS,
+                 min_confidence: float = MIN_CONFIDENCE) -> list:
+        """[(partner, shared commits, confidence)] for files that change with `filename`, strongest first
+
+        Confidence is the share of `filename`'s commits that also touched
+        the partner.
+        """
+        i = self.index.get(filename)
+        if i is None or not self.commits[i]:
+            return []
+        found = []
+        for j, shared in self.pairs.get(i, {}).items():
+            confidence = shared / self.commits[i]
+            if shared >= min_shared and confidence >= min_confidence:
+                found.append((self.names[j], shared, confidence))
+        found.sort(key=lambda partner: (partner[2], partner[1]), reverse=True)
+        return found
+
+    def save(self):
+        left, right, counts = array('l'), array('l'), array('l')
+        for i, row in self.pairs.items():
+            for j, count in row.items():
+                if i < j:
+                    left.append(i)
+                    right.append(j)
+                    counts.append(count)
+        payload = (self.tips, self.names, self.commits.tobytes(), left.tobytes(), right.tobytes(), counts.tobytes())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix('.tmp')
+        temp_path.write_bytes(_HEADER + zlib.compress(marshal.dumps(payload), 6))
+        temp_path.replace(self.path)
+
+
+def find_missing_partners(filenames: list, matrix: CoChangeMatrix, present: set, ignore=None) -> list:
+    """Changed files whose strongly coupled partners did not change
+
+    Each entry is {'filename', 'partner', 'shared', 'confidence'}, highest
+    confidence first. Only partners in `present` (the head tree's paths)
+    count, since history also pairs files that were later deleted or
+    renamed. `ignore(path)` drops files (e.g. generated or locale ones) on
+    either side of a pair.
+    """
+    changed = set(filenames)
+    missing = []
+    for filename in filenames:
+        if ignore and ignore(filename):
+            continue
+        for partner, shared, confidence in matrix.partners(filename):
+            if partner in present and partner not in changed and not (ignore and ignore(partner)):
+                missing.append({'filename': filename, 'partner': partner, 'shared': shared, 'confidence': confidence})
+    missing.sort(key=lambda entry: entry['confidence'], reverse=True)
+    return missing
+
+
+def render_missing_partner_lines(missing: list, limit: int = MAX_MISSING_LISTED) -> list:
+    """Prompt section listing usual partners that were left unchanged"""
+    if not missing:
+        return []
+    lines = [f"\n=== USUAL PARTNER FILES NOT CHANGED ({len(missing)}) ===\n",
+             "Changed file -> file it usually changes with (shared commits, share of its commits):\n\n"]
+    for entry in missing[:limit]:
+        lines.append(f"{entry['filename']} -> {entry['partner']} "
+                     f"({entry['shared']} commits, {entry['confidence']:.0%})\n")
+    if len(missing) > limit:
+        lines.append(f"... and {len(missing) - limit} more\n")
+    return lines
+
+
+def render_missing_partner_html(missing: list, limit: int = MAX_MISSING_LISTED) -> str:
+    """Report-page list of the same pairs"""
+    if not missing:
+        return '<div class="risk-item-description">Every strongly coupled partner changed alongside its file.</div>'
+    items = ''
+    for entry in missing[:limit]:
+        items += f'''
+            <div class="risk-item medium">
+                <div class="risk-item-title">{html.escape(entry['filename'])}</div>
+                <div class="risk-item-description">Usually changes with {html.escape(entry['partner'])} \
+({entry['shared']} commits, {entry['confidence']:.0%}), which was not changed</div>
+            </div>'''
+    if len(missing) > limit:
+        items += f'''
+            <div class="risk-item-description">… and {len(missing) - limit} more</div>'''
+    return items
@@ -0,0 +1,141 @@
+"""
+Content-addressed commit store shared across release ranges
+
+Consecutive compares (4.32→4.33, the 4.33.1 hotfix, RC1→RC2) overlap
+heavily. Commits are immutable once they have a SHA, so their metadata,
+enrichment (stats, PR links, checks) and any per-commit analysis are kept
+in one SQLite table keyed by SHA. Fetches consult it first and only go
+to the network for commits it has never seen.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+DEFAULT_COMMIT_STORE = '.cache/commits.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    sha TEXT PRIMARY KEY,
+    author TEXT,
+    date TEXT,
+    message TEXT,
+    enrichment TEXT,
+    analysis TEXT NOT NULL DEFAULT '{}',
+    updated_at REAL NOT NULL
+)
+"""
+
+# SQLite's default limit on bound parameters per statement is 999
+QUERY_BATCH_SIZE = 500
+
+
+class CommitStore:
+    """SQLite-backed store of per-commit data, keyed by full SHA"""
+
+    def __init__(self, path: str = DEFAULT_COMMIT_STORE):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(SCHEMA)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _select(self, columns: str, shas: list) -> dict:
+        rows = {}
+        with self.lock:
+            for start in range(0, len(shas), QUERY_BATCH_SIZE):
+                batch = shas[start:start + QUERY_BATCH_SIZE]
+                placeholders = ','.join('?' * len(batch))
+                query = f'SELECT sha, {columns} FROM commits WHERE sha IN ({placeholders})'
+                for row in self.connection.execute(query, batch):
+                    rows[row[0]] = row[1:]
+        return rows
+
+    def put_commits(self, commits: list):
+        """Record (sha, author, date, message) tuples, keeping any enrichment/analysis already stored"""
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.executemany(
+                'INSERT INTO commits (sha, author, date, message, updated_at) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(sha) DO UPDATE SET author=excluded.author, date=excluded.date, message=excluded.message',
+                [(sha, author, date, message, now) for sha, author, date, message in commits]
+            )
+
+    def get_enrichments(self, shas: list) -> dict:
+        """{sha: enrichment} for the SHAs that have one stored"""
+        rows = self._select('enrichment', shas)
+        return {sha: json.loads(row[0]) for sha, row in rows.items() if row[0]}
+
+    def put_enrichments(self, enrichments: dict):
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.executemany(
+                'INSERT INTO commits (sha, enrichment, updated_at) VALUES (?, ?, ?) '
+                'ON CONFLICT(sha) DO UPDATE SET enrichment=excluded.enrichment, updated_at=excluded.updated_at',
+                [(sha, json.dumps(enrichment), now) for sha, enrichment in enrichments.items()]
+            )
+
+    def get_analysis(self, shas: list, key: str) -> dict:
+        """{sha: value} of one named per-commit analysis result (e.g. a patch fingerprint)"""
+        rows = self._select('analysis', shas)
+        results = {}
+        for sha, row in rows.items():
+            analysis = json.loads(row[0])
+            if key in analysis:
+                results[sha] = analysis[key]
+        return results
+
+    def put_analysis(self, key: str, values: dict):
+        """Store {sha: value} under one analysis key, leaving other keys untouched"""
+        existing = self._select('analysis', list(values))
+        now = time.time()
+        rows = []
+        for sha, value in values.items():
+            analysis = json.loads(existing[sha][0]) if sha in existing else {}
+            analysis[key] = value
+            rows.append((sha, json.dumps(analysis), now))
+        with self.lock, self.connection:
+            self.connection.executemany(
+                'INSERT INTO commits (sha, analysis, updated_at) VALUES (?, ?, ?) '
+                'ON CONFLICT(sha) DO UPDATE SET analysis=excluded.analysis, updated_at=excluded.updated_at',
+                rows
+            )
+
+    def cached_enricher(self, enricher):
+        """Wrap an enricher(owner, repo, shas) so only commits the store hasn't seen hit the network"""
+        def enrich(owner: str, repo: str, shas: list) -> list:
+            stored = self.get_enrichments(shas)
+            missing = [sha for sha in shas if sha not in stored]
+            self.hits += len(shas) - len(missing)
+            self.misses += len(missing)
+            print(f"   🗄️  Commit store: {len(shas) - len(missing)} of {len(shas)} commits already enriched")
+
+            if missing:
+                fresh = dict(zip(missing, enricher(owner, repo, missing)))
+                # Only keep complete results; missing or partial ones are retried next run.
+                # Individual None fields (no check runs, no file count) are legitimate data.
+                complete = {sha: e for sha, e in fresh.items() if e and not e.get('partial')}
+                self.put_enrichments(complete)
+                stored.update({sha: e for sha, e in fresh.items() if e})
+            return [stored.get(sha) for sha in shas]
+        return enrich
+
+    def cached_analysis(self, key: str, compute):
+        """Wrap compute(shas) -> {sha: value} so each SHA's result is computed once and stored under `key`"""
+        def run(shas: list) -> dict:
+            stored = self.get_analysis(shas, key)
+            missing = [sha for sha in shas if sha not in stored]
+            if missing:
+                fresh = compute(missing)
+                self.put_analysis(key, fresh)
+                stored.update(fresh)
+            return stored
+        return run
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,161 @@
+"""
+Source/test pairing index
+
+Claude is asked to spot "lack of tests" but only sees a slice of the file
+list. This maps every `src/main` Kotlin/Java file to its conventional
+`src/test` / `src/androidTest` counterparts (FooTest, FooTests, FooSpec,
+FooInstrumentedTest in the same package, else the same class name
+anywhere in the module). The index is built from the full repository
+tree at the release head and cached by tree SHA, so it is rebuilt only
+when the tree changes. Each run then checks the changed files against it
+in one linear pass.
+"""
+
+import html
+import json
+import re
+from pathlib import Path
+
+from github_client import GitHubClient
+from local_git import run_git, resolve_ref
+
+
+DEFAULT_PAIRING_CACHE = '.cache/test_pairs'
+MAX_UNTESTED_LISTED = 40
+
+SOURCE_FILE = re.compile(r'^(?:(?P<module>.+)/)?src/main/(?:java|kotlin)/(?P<path>.+)\.(?:kt|java)$')
+TEST_FILE = re.compile(
+    r'^(?:(?P<module>.+)/)?src/(?:test|androidTest|testFixtures|sharedTest)/(?:java|kotlin)/'
+    r'(?P<path>.+?)(?:InstrumentedTest|Tests?|Spec|IT)\.(?:kt|java)$'
+)
+
+
+def _keys(module: str, path: str):
+    """(same-package key, same-module class-name key) for a source or test subject"""
+    module = module or ''
+    return f"{module}:{path}", f"{module}:{path.rsplit('/', 1)[-1]}"
+
+
+def build_pairing_index(paths) -> dict:
+    """{'by_path': {key: [tests]}, 'by_name': {key: [tests]}} over every test file in a tree"""
+    by_path = {}
+    by_name = {}
+    for path in paths:
+        match = TEST_FILE.match(path)
+        if match:
+            path_key, name_key = _keys(match['module'], match['path'])
+            by_path.setdefault(path_key, []).append(path)
+            by_name.setdefault(name_key, []).append(path)
+    return {'by_path': by_path, 'by_name': by_name}
+
+
+def tests_for(index: dict, filename: str):
+    """Test files paired with a src/main file, [] if it has none, or None if it isn't a source file"""
+    match = SOURCE_FILE.match(filename)
+    if not match:
+        return None
+    path_key, name_key = _keys(match['module'], match['path'])
+    return index['by_path'].get(path_key) or index['by_name'].get(name_key) or []
+
+
+def find_untested(filenames: list, index: dict) -> list:
+    """Changed source files whose paired tests were not changed alongside them
+
+    Each entry is {'filename', 'tests'}: `tests` lists the existing but
+    unchanged counterparts, and is empty when the file has no tests at all.
+    """
+    changed = set(filenames)
+    untested = []
+    for filename in filenames:
+        tests = tests_for(index, filename)
+        if tests is not None and not any(test in changed for test in tests):
+            untested.append({'filename': filename, 'tests': tests})
+    return untested
+
+
+def local_tree(repo_path: str, head: str):
+    """(tree SHA, lazy path lister) for the head of a local clone or mirror"""
+    tree_sha = run_git(repo_path, 'rev-parse', f"{resolve_ref(repo_path, head)}^{{tree}}").strip()
+    return tree_sha, lambda: run_git(repo_path, 'ls-tree', '-r', '--name-only', '-z', tree_sha).split('\x00')
+
+
+def github_tree(client: GitHubClient, owner: str, repo: str, head_sha: str):
+    """(tree SHA, lazy path lister) for a commit via the GitHub API"""
+    tree_sha = client.get_json(f"/repos/{owner}/{repo}/commits/{head_sha}")['commit']['tree']['sha']
+
+    def list_paths():
+        tree = client.get_json(f"/repos/{owner}/{repo}/git/trees/{tree_sha}", params={'recursive': 1})
+        if tree.get('truncated'):
+            print("   ⚠️  GitHub truncated the repository tree; some tests may be missing from the index")
+        return [entry['path'] for entry in tree['tree'] if entry['type'] == 'blob']
+    return tree_sha, list_paths
+
+
+def load_pairing_index(tree_sha: str, list_paths, cache_dir: str = DEFAULT_PAIRING_CACHE) -> dict:
+    """The pairing index for a tree, built with list_paths() only on a cache miss"""
+    cache_path = Path(cache_dir) / f"{tree_sha}.json"
+    if cache_path.exists():
+        print(f"   🗄️  Test pairing index cached for tree {tree_sha[:7]}")
+        return json.loads(cache_path.read_text())
+
+    index = build_pairing_index(list_paths())
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(index))
+    print(f"   ✅ Indexed {sum(map(len, index['by_path'].values()))} test files for tree {tree_sha[:7]}")
+    return index
+
+
+def untested_changes(release, client: GitHubClient = None, repo_path: str = None,
+                     cache_dir: str = DEFAULT_PAIRING_CACHE):
+    """find_untested over a Release, indexing the head tree from a local clone if given, else GitHub
+
+    Deleted files are neither flagged nor count as test changes. Returns
+    None when there is neither a clone nor a client to read the tree from.
+    """
+    if repo_path:
+        tree_sha, list_paths = local_tree(repo_path, release.head)
+    elif client is None:
+        return None
+    elif release.commits:
+        tree_sha, list_paths = github_tree(client, release.owner, release.repo, release.commits[-1].sha)
+    else:
+        return []
+    index = load_pairing_index(tree_sha, list_paths, cache_dir)
+    return find_untested([change.filename for change in release.files if change.status != 'removed'], index)
+
+
+def render_untested_lines(untested: list, limit: int = MAX_UNTESTED_LISTED) -> list:
+    """Prompt section listing source changes without test changes"""
+    if not untested:
+        return []
+    lines = [f"\n=== SOURCE CHANGES WITHOUT TEST CHANGES ({len(untested)}) ===\n\n"]
+    for entry in untested[:limit]:
+        if entry['tests']:
+            names = ', '.join(test.rsplit('/', 1)[-1] for test in entry['tests'])
+            lines.append(f"{entry['filename']} (tests exist but unchanged: {names})\n")
+        else:
+            lines.append(f"{entry['filename']} (no tests)\n")
+    if len(untested) > limit:
+        lines.append(f"... and {len(untested) - limit} more\n")
+    return lines
+
+
+def render_untested_html(untested: list, limit: int = MAX_UNTESTED_LISTED) -> str:
+    """Report-page list of the same set"""
+    if not untested:
+        return '<div class="risk-item-description">Every changed source file has a matching test change.</div>'
+    items = ''
+    for entry in untested[:limit]:
+        if entry['tests']:
+            detail = f"Tests exist but were not updated: {html.escape(', '.join(entry['tests']))}"
+        else:
+            detail = 'No tests'
+        items += f'''
+            <div class="risk-item medium">
+                <div class="risk-item-title">{html.escape(entry['filename'])}</div>
+                <div class="risk-item-description">{detail}</div>
+            </div>'''
+    if len(untested) > limit:
+        items += f'''
+            <div class="risk-item-description">… and {len(untested) - limit} more</div>'''
+    return items
@@ -0,0 +1,57 @@
+"""
+Asyncio fetch engine for fanning out GitHub enrichment calls
+
+Per-commit stats, associated PRs and check status need one request per
+commit each, so a 300-commit RC means ~900 calls. The engine runs them
+concurrently under a semaphore, each with its own deadline, and hands the
+results back in the order they were requested. Requests go through the
+shared GitHubClient (pool, cache) on worker threads, so no extra HTTP
+dependency is needed.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from github_client import GitHubClient, DEFAULT_REQUEST_DEADLINE
+
+
+DEFAULT_CONCURRENCY = 10
+
+
+class AsyncFetchEngine:
+    """Bounded-concurrency, deadline-aware batch fetcher on top of GitHubClient"""
+
+    def __init__(self, client: GitHubClient, concurrency: int = DEFAULT_CONCURRENCY,
+                 deadline: float = DEFAULT_REQUEST_DEADLINE):
+        self.client = client
+        self.concurrency = concurrency
+        self.deadline = deadline
+        self.failures = []
+
+    async def _fetch_one(self, semaphore: asyncio.Semaphore, executor: ThreadPoolExecutor, fetch, path: str):
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(executor, fetch, path),
+                    timeout=self.deadline
+                )
+            except asyncio.TimeoutError:
+                self.failures.append((path, f'deadline of {self.deadline:.0f}s exceeded'))
+            except Exception as e:
+                self.failures.append((path, str(e)))
+            return None
+
+    async def fetch_all_async(self, paths: list, fetch=None) -> list:
+        """Fetch every path concurrently; results keep the input order, None on failure
+
+        `fetch` defaults to GitHubClient.get_json; pass e.g. get_raw for file contents.
+        """
+        fetch = fetch or self.client.get_json
+        semaphore = asyncio.Semaphore(self.concurrency)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            return await asyncio.gather(*(self._fetch_one(semaphore, executor, fetch, path) for path in paths))
+
+    def fetch_all(self, paths: list, fetch=None) -> list:
+        """Synchronous entry point for fetch_all_async"""
+        return asyncio.run(self.fetch_all_async(paths, fetch))
@@ -0,0 +1,391 @@
+"""
+GitHub API client shared by every GitHub call in the weekly automation
+
+All traffic goes through one pooled keep-alive session, so paginated
+compares, per-commit details and PR metadata reuse the same TLS
+connections instead of paying a fresh handshake per request.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import HTTPCache, cache_key_url
+from single_flight import SingleFlight
+
+
+GITHUB_API_URL = "https://api.github.com"
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 30
+DEFAULT_REQUEST_DEADLINE = 20.0
+RAW_MEDIA_TYPE = 'application/vnd.github.raw'
+
+# Start spreading requests across the reset window once the remaining
+# budget drops below this fraction of the hourly limit
+RATE_LIMIT_PACING_FRACTION = 0.2
+# Requests held back for other tools sharing the same token
+RATE_LIMIT_RESERVE = 5
+MAX_RATE_LIMIT_RETRIES = 5
+MAX_BACKOFF_SECONDS = 120
+
+# Hedge a GET once it runs past the observed p95 latency; until enough
+# samples exist, use a fixed delay
+HEDGE_MIN_SAMPLES = 10
+HEDGE_DEFAULT_DELAY = 2.0
+HEDGE_MIN_DELAY = 0.25
+
+
+class DeadlineExceeded(Exception):
+    """A GitHub call, or the whole run, went past its deadline"""
+
+
+class RateLimiter:
+    """Tracks the X-RateLimit budget and paces or backs off requests accordingly"""
+
+    def __init__(self, pacing_fraction: float = RATE_LIMIT_PACING_FRACTION,
+                 reserve: int = RATE_LIMIT_RESERVE):
+        self.pacing_fraction = pacing_fraction
+        self.reserve = reserve
+        self.lock = threading.Lock()
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None
+        self.next_slot = 0.0
+        self.budget_used = 0
+        self.waited_seconds = 0.0
+        self.backoffs = 0
+
+    def acquire(self, time_left: float = None):
+        """Block until the next request may go out without exhausting the budget
+
+        Raises DeadlineExceeded instead of waiting past `time_left` seconds.
+        """
+        with self.lock:
+            now = time.time()
+            delay = 0.0
+            if self.remaining is not None and self.reset_at is not None and self.reset_at > now:
+                window = self.reset_at - now
+                if self.remaining <= self.reserve:
+                    delay = window + 1
+                elif self.remaining < self.limit * self.pacing_fraction:
+                    # Spread what is left evenly over the rest of the window
+                    interval = window / (self.remaining - self.reserve)
+                    slot = max(self.next_slot, now)
+                    self.next_slot = slot + interval
+                    delay = slot - now
+        if time_left is not None and delay >= time_left:
+            raise DeadlineExceeded(f"Rate limit budget needs a {delay:.0f}s wait with {time_left:.0f}s "
+                                   f"of run deadline left")
+        if delay > 0:
+            self.waited_seconds += delay
+            time.sleep(delay)
+
+    def update(self, response: requests.Response):
+        """Record the budget reported by a response"""
+        headers = response.headers
+        if 'X-RateLimit-Remaining' not in headers:
+            return
+        with self.lock:
+            remaining = int(headers['X-RateLimit-Remaining'])
+            reset_at = int(headers.get('X-RateLimit-Reset', 0)) or None
+            if self.remaining is not None and reset_at == self.reset_at and remaining < self.remaining:
+                self.budget_used += self.remaining - remaining
+            elif self.remaining is None or reset_at != self.reset_at:
+                # New window: charge this request to the budget
+                self.budget_used += 1
+            self.limit = int(headers.get('X-RateLimit-Limit', self.limit or 5000))
+            self.remaining = remaining
+            self.reset_at = reset_at
+
+    def backoff_delay(self, response: requests.Response, attempt: int):
+        """Seconds to wait before retrying a rate-limited response, or None if it isn't one"""
+        if response.status_code not in (403, 429):
+            return None
+
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            return float(retry_after)
+
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            reset_at = int(response.headers.get('X-RateLimit-Reset', 0))
+            return max(reset_at - time.time(), 0) + 1
+
+        # Secondary rate limits don't always say when to come back: exponential backoff with full jitter
+        if 'rate limit' in response.text.lower():
+            return random.uniform(0, min(MAX_BACKOFF_SECONDS, 2 ** (attempt + 2)))
+        return None
+
+    def stats(self) -> dict:
+        return {
+            'budget_used': self.budget_used,
+            'remaining': self.remaining,
+            'limit': self.limit,
+            'reset_at': self.reset_at,
+            'waited_seconds': self.waited_seconds,
+            'backoffs': self.backoffs,
+        }
+
+
+class GitHubClient:
+    """Pooled GitHub REST client that records connection reuse and latency"""
+
+    def __init__(self, token: str, pool_size: int = DEFAULT_POOL_SIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT, cache: HTTPCache = None,
+                 api_url: str = GITHUB_API_URL, request_deadline: float = DEFAULT_REQUEST_DEADLINE,
+                 hedge: bool = False, run_deadline: float = None):
+        self.api_url = api_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache = cache
+        self.rate_limiter = RateLimiter()
+        self.flights = SingleFlight()
+        self.latencies = []
+
+        self.request_deadline = request_deadline
+        self.hedge = hedge
+        self.run_deadline_at = time.monotonic() + run_deadline if run_deadline else None
+        # Requests run on worker threads so a deadline can abandon them
+        self.workers = ThreadPoolExecutor(max_workers=pool_size * 2, thread_name_prefix='github')
+        self.hedges_fired = 0
+        self.hedge_wins = 0
+        self.deadline_misses = 0
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'token {token}',
+            'Accept': 'application/vnd.github.v3+json',
+            'Accept-Encoding': 'gzip, deflate',
+            'User-Agent': 'risk-dashboard-weekly-automation'
+        })
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+    def url(self, path: str) -> str:
+        """Turn an API path like /repos/o/r into a full URL; full URLs pass through"""
+        if path.startswith('http'):
+            return path
+        return f"{self.api_url}/{path.lstrip('/')}"
+
+    def get(self, path: str, params: dict = None, **kwargs) -> requests.Response:
+        """GET an API path or URL on the pooled session, going through the cache if any
+        
+        Identical GETs already in flight on another thread share that
+        thread's response instead of issuing their own request.
+        """
+        url = self.url(path)
+        if kwargs.get('stream'):
+            return self._send('GET', url, params, **kwargs)
+
+        key = cache_key_url(url, params)
+        accept = (kwargs.get('headers') or {}).get('Accept')
+        if accept:
+            # Same URL, different representation
+            key += f' {accept}'
+        return self.flights.do(key, self._get_cached, url, key, params, **kwargs)
+
+    def _get_cached(self, url: str, key: str, params: dict = None, **kwargs) -> requests.Response:
+        if self.cache is None:
+            return self._send('GET', url, params, **kwargs)
+
+        cached = self.cache.lookup(key)
+        if cached:
+            meta, body = cached
+            if meta.get('immutable'):
+                self.cache.hits += 1
+                return self.cache.build_response(key, meta, body)
+            headers = dict(kwargs.pop('headers', None) or {})
+            headers.update(self.cache.conditional_headers(meta))
+            kwargs['headers'] = headers
+
+        response = self._send('GET', url, params, **kwargs)
+        if cached and response.status_code == 304:
+            self.cache.revalidated += 1
+            return self.cache.build_response(key, *cached)
+
+        self.cache.misses += 1
+        if response.status_code == 200:
+            self.cache.store(key, response)
+        return response
+
+    def iter_paginated(self, path: str, params: dict = None, per_page: int = 100):
+        """Yield every item of a list endpoint, following the Link header page by page"""
+        url = path
+        params = dict(params or {}, per_page=per_page)
+        while url:
+            response = self.get(url, params=params)
+            response.raise_for_status()
+            yield from response.json()
+            # The "next" link already carries the query
+            url = response.links.get('next', {}).get('url')
+            params = None
+
+    def get_raw(self, path: str, params: dict = None) -> str:
+        """GET a contents path as raw file text rather than JSON"""
+        response = self.get(path, params=params, headers={'Accept': RAW_MEDIA_TYPE})
+        response.raise_for_status()
+        return response.text
+
+    def post_json(self, path: str, payload: dict):
+        """POST a JSON payload (e.g. a GraphQL query) and return the decoded JSON body"""
+        response = self._send('POST', self.url(path), json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def run_time_left(self) -> float:
+        """Seconds until the run deadline, or None when there isn't one"""
+        if self.run_deadline_at is None:
+            return None
+        return self.run_deadline_at - time.monotonic()
+
+    def _send(self, method: str, url: str, params: dict = None, **kwargs) -> requests.Response:
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self.rate_limiter.acquire(self.run_time_left())
+            response = self._request(method, url, params, **kwargs)
+            self.rate_limiter.update(response)
+
+            delay = self.rate_limiter.backoff_delay(response, attempt)
+            if delay is None or attempt == MAX_RATE_LIMIT_RETRIES:
+                return response
+            time_left = self.run_time_left()
+            if time_left is not None and delay >= time_left:
+                raise DeadlineExceeded(f"Rate limited with {time_left:.0f}s of run deadline left")
+            print(f"   ⏳ GitHub rate limit hit, retrying in {delay:.0f}s...")
+            self.rate_limiter.backoffs += 1
+            self.rate_limiter.waited_seconds += delay
+            time.sleep(delay)
+        return response
+
+    def _timed_request(self, method: str, url: str, params: dict = None, **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        response = self.session.request(method, url, params=params, **kwargs)
+        self.latencies.append(time.perf_counter() - start)
+        return response
+
+    def hedge_delay(self) -> float:
+        """p95 of observed latencies, the point after which a GET gets a duplicate"""
+        if len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        latencies = sorted(self.latencies)
+        return max(latencies[int(len(latencies) * 0.95)], HEDGE_MIN_DELAY)
+
+    def _request(self, method: str, url: str, params: dict = None, **kwargs) -> requests.Response:
+        """One request under the per-call deadline, hedged with a duplicate GET past the p95 latency"""
+        deadline = self.request_deadline
+        time_left = self.run_time_left()
+        if time_left is not None:
+            if time_left <= 0:
+                raise DeadlineExceeded("Run deadline reached")
+            deadline = min(deadline, time_left)
+        kwargs.setdefault('timeout', (self.timeout[0], min(self.timeout[1], deadline)))
+
+        can_hedge = self.hedge and method == 'GET' and not kwargs.get('stream')
+        hedge_after = self.hedge_delay() if can_hedge else None
+        start = time.monotonic()
+        first = self.workers.submit(self._timed_request, method, url, params, **kwargs)
+        pending = [first]
+        error = None
+
+        while True:
+            elapsed = time.monotonic() - start
+            if elapsed >= deadline:
+                self.deadline_misses += 1
+                for future in pending:
+                    future.add_done_callback(_close_response)
+                raise DeadlineExceeded(f"GET {url} took longer than {deadline:.1f}s")
+
+            timeout = deadline - elapsed
+            if can_hedge and len(pending) == 1 and pending[0] is first:
+                timeout = min(timeout, max(hedge_after - elapsed, 0))
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                pending.remove(future)
+                if future.exception() is None:
+                    # First successful answer wins; close whatever the other copy returns
+                    for loser in pending:
+                        loser.add_done_callback(_close_response)
+                    if future is not first:
+                        self.hedge_wins += 1
+                    return future.result()
+                error = future.exception()
+
+            if not pending and error is not None:
+                raise error
+            if can_hedge and first in pending and len(pending) == 1 and time.monotonic() - start >= hedge_after:
+                self.hedges_fired += 1
+                pending.append(self.workers.submit(self._timed_request, method, url, params, **kwargs))
+
+    def get_json(self, path: str, params: dict = None):
+        """GET an API path and return the decoded JSON body"""
+        response = self.get(path, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def stats(self) -> dict:
+        """Connection reuse and latency figures for the requests made so far"""
+        connections = 0
+        pooled_requests = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+                pooled_requests += pool.num_requests
+
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            'requests': count,
+            'connections_opened': connections,
+            'connections_reused': max(pooled_requests - connections, 0),
+            'latency_avg_ms': sum(latencies) / count * 1000 if count else 0.0,
+            'latency_p50_ms': latencies[count // 2] * 1000 if count else 0.0,
+            'latency_p95_ms': latencies[min(int(count * 0.95), count - 1)] * 1000 if count else 0.0,
+            'latency_max_ms': latencies[-1] * 1000 if count else 0.0,
+        }
+
+    def print_stats(self):
+        """Print the end-of-run GitHub traffic summary"""
+        stats = self.stats()
+        if not stats['requests'] and self.cache is None:
+            return
+        print(f"\n🌐 GitHub API usage:")
+        print(f"   Requests: {stats['requests']}")
+        print(f"   Connections: {stats['connections_opened']} opened, {stats['connections_reused']} reused")
+        print(f"   Latency: avg {stats['latency_avg_ms']:.0f}ms • "
+              f"p50 {stats['latency_p50_ms']:.0f}ms • "
+              f"p95 {stats['latency_p95_ms']:.0f}ms • "
+              f"max {stats['latency_max_ms']:.0f}ms")
+        if self.hedge or self.deadline_misses:
+            print(f"   Hedging: {self.hedges_fired} hedged GETs, {self.hedge_wins} won by the hedge, "
+                  f"{self.deadline_misses} deadline misses")
+        flight_stats = self.flights.stats()
+        print(f"   Coalesced: {flight_stats['shared']} of {flight_stats['calls']} GETs shared an in-flight request")
+        limit_stats = self.rate_limiter.stats()
+        if limit_stats['remaining'] is not None:
+            print(f"   Rate limit: {limit_stats['budget_used']} used, "
+                  f"{limit_stats['remaining']}/{limit_stats['limit']} remaining, "
+                  f"{limit_stats['waited_seconds']:.0f}s throttled, "
+                  f"{limit_stats['backoffs']} backoffs")
+        if self.cache is not None:
+            cache_stats = self.cache.stats()
+            print(f"   Cache: {cache_stats['hits']} immutable hits, "
+                  f"{cache_stats['revalidated']} revalidated (304), "
+                  f"{cache_stats['misses']} misses, "
+                  f"{cache_stats['evictions']} evicted, "
+                  f"{cache_stats['size_bytes'] / 1024 / 1024:.1f} MB on disk")
+
+    def close(self):
+        self.workers.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+
+def _close_response(future):
+    """Done-callback that releases the connection held by an abandoned request"""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
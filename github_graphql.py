@@ -0,0 +1,108 @@
+"""
+GraphQL batch backend for commit enrichment
+
+Instead of three REST calls per commit, one GraphQL query looks up to 100
+commits by SHA and returns their stats, check status and associated PRs
+(labels, review counts, merge info) in a single round trip. Results use
+the same per-commit shape as the REST enrichment, so the changelog
+renders the same way whichever backend produced them.
+"""
+
+import requests
+
+from github_client import GitHubClient
+
+
+GRAPHQL_BATCH_SIZE = 100
+MAX_PRS_PER_COMMIT = 5
+MAX_LABELS_PER_PR = 10
+
+COMMIT_FIELDS = f"""
+      ... on Commit {{
+        additions
+        deletions
+        changedFilesIfAvailable
+        statusCheckRollup {{ state }}
+        associatedPullRequests(first: {MAX_PRS_PER_COMMIT}) {{
+          nodes {{
+            number
+            title
+            mergedAt
+            mergedBy {{ login }}
+            labels(first: {MAX_LABELS_PER_PR}) {{ nodes {{ name }} }}
+            reviews {{ totalCount }}
+            approvals: reviews(states: APPROVED) {{ totalCount }}
+          }}
+        }}
+      }}"""
+
+
+def build_commit_query(shas: list) -> str:
+    """One aliased `object(oid:)` lookup per SHA inside a single repository query"""
+    lookups = ''.join(
+        f'\n    c{i}: object(oid: "{sha}") {{{COMMIT_FIELDS}\n    }}'
+        for i, sha in enumerate(shas)
+    )
+    return f"query($owner: String!, $repo: String!) {{\n  repository(owner: $owner, name: $repo) {{{lookups}\n  }}\n}}"
+
+
+def commit_node_to_enrichment(node: dict) -> dict:
+    """Convert a GraphQL Commit node to the enrichment shape used by format_commit"""
+    if not node:
+        return None
+
+    pulls = []
+    for pr in node.get('associatedPullRequests', {}).get('nodes', []):
+        pulls.append({
+            'number': pr['number'],
+            'title': pr['title'],
+            'labels': [label['name'] for label in pr.get('labels', {}).get('nodes', [])],
+            'reviews': pr.get('reviews', {}).get('totalCount', 0),
+            'approvals': pr.get('approvals', {}).get('totalCount', 0),
+            'merged_at': pr.get('mergedAt'),
+            'merged_by': (pr.get('mergedBy') or {}).get('login'),
+        })
+
+    rollup = node.get('statusCheckRollup') or {}
+    return {
+        'stats': {'additions': node.get('additions', 0), 'deletions': node.get('deletions', 0)},
+        'files': node.get('changedFilesIfAvailable'),
+        'pulls': pulls,
+        'checks': rollup.get('state', '').lower() or None,
+    }
+
+
+def enrich_commits_graphql(client: GitHubClient, owner: str, repo: str, shas: list,
+                           batch_size: int = GRAPHQL_BATCH_SIZE) -> list:
+    """Enrich commits via batched GraphQL queries; returns one dict (or None) per SHA, in order
+
+    A batch whose request fails leaves None for its commits, like a failed
+    REST enrichment, instead of aborting the run.
+    """
+    batches = (len(shas) + batch_size - 1) // batch_size
+    print(f"   🔎 Enriching {len(shas)} commits via GraphQL ({batches} queries)...")
+
+    enriched = []
+    failed_batches = 0
+    for start in range(0, len(shas), batch_size):
+        batch = shas[start:start + batch_size]
+        try:
+            result = client.post_json('/graphql', {
+                'query': build_commit_query(batch),
+                'variables': {'owner': owner, 'repo': repo},
+            })
+        except requests.RequestException as e:
+            print(f"   ⚠️  GraphQL batch of {len(batch)} commits failed: {e}")
+            failed_batches += 1
+            enriched.extend([None] * len(batch))
+            continue
+        if result.get('errors'):
+            print(f"   ⚠️  GraphQL returned {len(result['errors'])} errors: {result['errors'][0].get('message')}")
+
+        repository = (result.get('data') or {}).get('repository') or {}
+        enriched.extend(commit_node_to_enrichment(repository.get(f'c{i}')) for i in range(len(batch)))
+
+    if failed_batches:
+        print(f"   ⚠️  {failed_batches} of {batches} GraphQL batches failed")
+    print(f"   ✅ Enriched {sum(1 for e in enriched if e)} commits")
+    return enriched
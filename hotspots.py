@@ -0,0 +1,238 @@
+"""
+Historical hotspot index
+
+Keeps, per repository, a decay-weighted churn total and a P0 hit count
+for every file and module seen in past releases. After each run the old
+churn is decayed and the new release's churn added, and files or modules
+that Claude's P0 items named are counted. The changelog lists files
+ordered by current risk boosted by this history, instead of the order
+GitHub happens to return them in.
+
+Names live in one list per table and the numbers in parallel `array`
+columns. On disk the names are JSON and the columns little-endian 8-byte
+values, so the file reads back the same under any Python version. A file
+that can't be read is moved aside rather than overwritten, because this
+history cannot be rebuilt from git the way the other caches can.
+"""
+
+import json
+import math
+import re
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+
+from tickets import TICKET_PATTERN, find_tickets
+
+
+DEFAULT_HOTSPOT_DIR = '.cache/hotspots'
+
+# Past churn loses a fifth of its weight per release
+CHURN_DECAY = 0.8
+P0_HIT_WEIGHT = 2.0
+MAX_RELEASES_REMEMBERED = 200
+
+_MAGIC = b'RDHS'
+FORMAT_VERSION = 2
+_LENGTH = struct.Struct('<I')
+
+# P0 bullets name classes (FooViewModel, Api) or whole file names
+# (build.gradle.kts); plain words only count against module names
+CLASS_NAME = re.compile(r'\b[A-Z][A-Za-z0-9]{2,}\b')
+FILE_NAME = re.compile(r'[\w-]+(?:\.[\w-]+)+')
+WORD = re.compile(r'[A-Za-z][A-Za-z0-9_-]{2,}')
+# Stems and module names too common to point at one file or module
+GENERIC_NAMES = frozenset({
+    'app', 'base', 'build', 'common', 'config', 'constants', 'core', 'helpers', 'index', 'main', 'manifest',
+    'module', 'readme', 'settings', 'src', 'strings', 'test', 'tests', 'util', 'utils', '(root)',
+})
+
+
+class _Table:
+    """Names plus parallel churn / P0-hit columns"""
+
+    def __init__(self, names=(), churn=b'', p0_hits=b''):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.churn = _column('d', churn)
+        self.p0_hits = _column('q', p0_hits)
+        if len(self.churn) != len(self.names) or len(self.p0_hits) != len(self.names):
+            raise ValueError("column lengths do not match the names")
+
+    def slot(self, name: str) -> int:
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.names)
+            self.names.append(name)
+            self.churn.append(0.0)
+            self.p0_hits.append(0)
+        return i
+
+    def decay(self, factor: float):
+        for i in range(len(self.churn)):
+            self.churn[i] *= factor
+
+    def score(self, name: str) -> float:
+        i = self.index.get(name)
+        return 0.0 if i is None else self.churn[i] + P0_HIT_WEIGHT * self.p0_hits[i]
+
+    def columns(self) -> bytes:
+        return _little_endian(self.churn) + _little_endian(self.p0_hits)
+
+
+def _column(typecode: str, raw: bytes) -> array:
+    column = array(typecode)
+    column.frombytes(raw)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column
+
+
+def _little_endian(column: array) -> bytes:
+    if sys.byteorder == 'big':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+class HotspotIndex:
+    """Decay-weighted churn and P0 hits per file and per module of one repository"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.files = _Table()
+        self.modules = _Table()
+        self.releases = []
+        try:
+            data = self.path.read_bytes()
+        except OSError:
+            return
+        try:
+            self._load(data)
+        except (ValueError, KeyError, TypeError, struct.error, zlib.error) as e:
+            backup = self.path.with_name(self.path.name + '.bak')
+            self.path.replace(backup)
+            print(f"   ⚠️  Hotspot index {self.path} unreadable ({e}); moved to {backup}, starting without history")
+            self.files = _Table()
+            self.modules = _Table()
+            self.releases = []
+
+    def _load(self, data: bytes):
+        if data[:len(_MAGIC)] != _MAGIC:
+            raise ValueError("not a hotspot index")
+        if data[len(_MAGIC):len(_MAGIC) + 1] != bytes([FORMAT_VERSION]):
+            raise ValueError(f"unsupported format version {data[len(_MAGIC)]}")
+        body = zlib.decompress(data[len(_MAGIC) + 1:])
+        (header_size,) = _LENGTH.unpack_from(body)
+        header = json.loads(body[_LENGTH.size:_LENGTH.size + header_size])
+        offset = _LENGTH.size + header_size
+        tables = []
+        for names in (header['files'], header['modules']):
+            size = 8 * len(names)
+            tables.append(_Table(names, body[offset:offset + size], body[offset + size:offset + 2 * size]))
+            offset += 2 * size
+        if offset != len(body):
+            raise ValueError("column data does not match the names")
+        self.releases = list(header['releases'])
+        self.files, self.modules = tables
+
+    @classmethod
+    def for_repo(cls, root: str, owner: str, repo: str):
+        return cls(Path(root) / owner / f"{repo}.bin")
+
+    def file_score(self, filename: str) -> float:
+        return self.files.score(filename)
+
+    def boost(self, filename: str) -> float:
+        """Multiplier applied to a file's current risk score, 1.0 for files with no history"""
+        return 1.0 + math.log1p(self.file_score(filename))
+
+    def describe(self, filename: str) -> str:
+        """Short history note for a file, or '' if it has none"""
+        i = self.files.index.get(filename)
+        if i is None:
+            return ''
+        note = f"hotspot: churn {self.files.churn[i]:.1f} over past releases"
+        if self.files.p0_hits[i]:
+            note += f", in {self.files.p0_hits[i]} past P0 items"
+        return note
+
+    def record_release(self, release_id: str, files: list, module_of, p0_texts: list) -> bool:
+        """Fold one release into the index; False if it was already recorded
+
+        `files` are FileChange-like objects, `module_of(filename)` maps them
+        to modules, and `p0_texts` are Claude's P0 bullets. A file counts as
+        hit when a P0 bullet names its file name or its class (a capitalised
+        stem outside GENERIC_NAMES), and a module when one of its files is
+        hit or a bullet names the module.
+        """
+        if release_id in self.releases:
+            return False
+        self.files.decay(CHURN_DECAY)
+        self.modules.decay(CHURN_DECAY)
+
+        mentions = P0Mentions(p0_texts)
+        hit_modules = set()
+        for change in files:
+            churn = math.log1p(change.additions + change.deletions)
+            module = module_of(change.filename)
+            i = self.files.slot(change.filename)
+            j = self.modules.slot(module)
+            self.files.churn[i] += churn
+            self.modules.churn[j] += churn
+            if mentions.names_file(change.filename):
+                self.files.p0_hits[i] += 1
+                hit_modules.add(j)
+            elif mentions.names_module(module):
+                hit_modules.add(j)
+        for j in hit_modules:
+            self.modules.p0_hits[j] += 1
+
+        self.releases = (self.releases + [release_id])[-MAX_RELEASES_REMEMBERED:]
+        return True
+
+    def save(self):
+        header = json.dumps({'releases': self.releases, 'files': self.files.names,
+                             'modules': self.modules.names}).encode()
+        body = _LENGTH.pack(len(header)) + header + self.files.columns() + self.modules.columns()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix('.tmp')
+        temp_path.write_bytes(_MAGIC + bytes([FORMAT_VERSION]) + zlib.compress(body, 6))
+        temp_path.replace(self.path)
+
+
+class P0Mentions:
+    """File names, class names and words named by a release's P0 bullets"""
+
+    def __init__(self, p0_texts: list):
+        # Ticket keys (VOICE-12) are not class or module names
+        texts = [TICKET_PATTERN.sub(' ', text) for text in p0_texts]
+        self.file_names = {name for text in texts for name in FILE_NAME.findall(text)}
+        self.class_names = {name for text in texts for name in CLASS_NAME.findall(text)}
+        self.words = {word.lower() for text in texts for word in WORD.findall(text)}
+        self.text = '\n'.join(texts)
+
+    def names_file(self, filename: str) -> bool:
+        basename = filename.rsplit('/', 1)[-1]
+        if basename in self.file_names:
+            return True
+        stem = basename.split('.', 1)[0]
+        return stem[:1].isupper() and stem.lower() not in GENERIC_NAMES and stem in self.class_names
+
+    def names_module(self, module: str) -> bool:
+        leaf = module.rsplit('/', 1)[-1].lower()
+        if leaf in GENERIC_NAMES:
+            return False
+        return leaf in self.words or ('/' in module and module in self.text)
+
+
+def p0_item_texts(p0_items: list, ticket_groups: dict = None) -> list:
+    """Each P0 bullet, followed by the titles of the release's tickets it names"""
+    texts = []
+    for item in p0_items:
+        titles = [ticket_groups[key]['title'] for key in find_tickets(item['full_text'])
+                  if ticket_groups and key in ticket_groups]
+        texts.append('\n'.join([item['full_text']] + titles))
+    return texts
@@ -0,0 +1,146 @@
+"""
+Persistent HTTP cache for GitHub API responses
+
+Entries are keyed by URL and keep the ETag / Last-Modified validators so
+re-runs can send conditional requests and serve 304s from disk. Responses
+that can never change (commits and file contents at a full SHA) are marked immutable
+and served without touching the network. The cache directory is capped in
+size and evicts least-recently-used entries.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+DEFAULT_CACHE_DIR = '.cache/github'
+DEFAULT_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Headers worth replaying on a cached response (Link drives pagination)
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Link')
+
+# /repos/{owner}/{repo}/commits/{full sha} and file contents at a full
+# SHA never change once they exist
+IMMUTABLE_URL_PATTERN = re.compile(
+    r'/repos/[^/]+/[^/]+/(commits/[0-9a-f]{40}(?:\?|\s|$)|contents/[^?]+\?ref=[0-9a-f]{40}(?:&|\s|$))'
+)
+
+
+def cache_key_url(url: str, params: dict = None) -> str:
+    """Canonical URL (with sorted query params) used as the cache key"""
+    if not params:
+        return url
+    separator = '&' if '?' in url else '?'
+    return url + separator + urlencode(sorted(params.items()))
+
+
+class HTTPCache:
+    """Size-capped, LRU-evicted on-disk store of GitHub responses"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = sum(path.stat().st_size for path in self.cache_dir.glob('*.body'))
+
+    def _paths(self, url: str):
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        return self.cache_dir / f'{digest}.json', self.cache_dir / f'{digest}.body'
+
+    def is_immutable(self, url: str) -> bool:
+        return bool(IMMUTABLE_URL_PATTERN.search(url))
+
+    def lookup(self, url: str):
+        """Return (metadata, body) for a cached URL, or None"""
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text())
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url:
+            return None
+        # Touch the entry so eviction sees it as recently used
+        os.utime(body_path)
+        return meta, body
+
+    def conditional_headers(self, meta: dict) -> dict:
+        """If-None-Match / If-Modified-Since headers for a cached entry"""
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def store(self, url: str, response: requests.Response):
+        """Save a 200 response that carries a validator or is immutable"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        immutable = self.is_immutable(url)
+        if not (etag or last_modified or immutable):
+            return
+
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'immutable': immutable,
+            'headers': {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers},
+        }
+        body = response.content
+        meta_path, body_path = self._paths(url)
+
+        with self.lock:
+            if body_path.exists():
+                self.total_bytes -= body_path.stat().st_size
+            body_path.write_bytes(body)
+            meta_path.write_text(json.dumps(meta))
+            self.total_bytes += len(body)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least-recently-used entries until the cache is back under 90% of its cap"""
+        target = self.max_bytes * 0.9
+        bodies = sorted(self.cache_dir.glob('*.body'), key=lambda path: path.stat().st_mtime)
+        for body_path in bodies:
+            if self.total_bytes <= target:
+                break
+            size = body_path.stat().st_size
+            body_path.unlink(missing_ok=True)
+            body_path.with_suffix('.json').unlink(missing_ok=True)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def build_response(self, url: str, meta: dict, body: bytes) -> requests.Response:
+        """Rebuild a 200 requests.Response from a cached entry"""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        response._content = body
+        response.encoding = 'utf-8'
+        response.from_cache = True
+        return response
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'revalidated': self.revalidated,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size_bytes': self.total_bytes,
+        }
@@ -0,0 +1,121 @@
+"""
+Iterative JSON parsing of large API payloads
+
+`response.json()` materialises the whole compare body, patches and all,
+as Python objects. For monorepo ranges that is hundreds of MB. This parser
+walks the top-level object of a streamed response instead: selected array
+members (commits, files) are decoded and yielded one element at a time,
+everything else is decoded as a normal value. Peak memory is one element
+plus the read buffer.
+"""
+
+import codecs
+import json
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+WHITESPACE = ' \t\n\r'
+
+_decoder = json.JSONDecoder()
+
+
+class _Buffer:
+    """Text buffer over an iterator of byte chunks"""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self, min_size: int = 0) -> bool:
+        """Read until at least min_size chars are buffered past pos; False once the stream is exhausted"""
+        if self.pos > STREAM_CHUNK_SIZE and self.pos > len(self.text) // 2:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        target = self.pos + max(min_size, 1)
+        while len(self.text) < target:
+            try:
+                chunk = next(self.chunks)
+            except StopIteration:
+                if not self.exhausted:
+                    self.text += self.decoder.decode(b'', final=True)
+                    self.exhausted = True
+                return len(self.text) > self.pos
+            self.text += self.decoder.decode(chunk)
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace char (not consumed), or '' at end of stream"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode one complete JSON value at pos, reading more of the stream as needed"""
+        self.peek()
+        want = len(self.text) - self.pos
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                # A value running right up to the buffer end may be a cut-off number or literal
+                if end < len(self.text) or self.exhausted:
+                    self.pos = end
+                    return value
+            except ValueError:
+                if self.exhausted:
+                    raise
+            # Grow geometrically so a large element isn't re-parsed once per chunk
+            want = max(want * 2, STREAM_CHUNK_SIZE)
+            self.fill(want)
+
+
+def iter_json_object(chunks, stream_keys=('commits', 'files')):
+    """Yield ('value', key, value) and ('item', key, element) events for a top-level JSON object
+
+    Members named in stream_keys must be arrays; their elements are yielded
+    one by one as ('item', key, element). Every other member is yielded
+    whole as ('value', key, value), in document order.
+    """
+    buffer = _Buffer(chunks)
+    buffer.expect('{')
+    if buffer.peek() == '}':
+        return
+
+    while True:
+        key = buffer.value()
+        buffer.expect(':')
+
+        if key in stream_keys and buffer.peek() == '[':
+            buffer.expect('[')
+            if buffer.peek() == ']':
+                buffer.pos += 1
+            else:
+                while True:
+                    yield 'item', key, buffer.value()
+                    separator = buffer.peek()
+                    buffer.pos += 1
+                    if separator == ']':
+                        break
+                    if separator != ',':
+                        raise ValueError(f"Expected ',' or ']' in {key!r}, found {separator!r}")
+        else:
+            yield 'value', key, buffer.value()
+
+        separator = buffer.peek()
+        buffer.pos += 1
+        if separator == '}':
+            return
+        if separator != ',':
+            raise ValueError(f"Expected ',' or '}}' after {key!r}, found {separator!r}")
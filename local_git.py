@@ -0,0 +1,160 @@
+"""
+Local git changelog source
+
+Builds the same compare stream as the GitHub API (see iter_compare in
+weekly_automation_with_fetch.py) from a local clone or bare mirror, using
+`git log base..head` and `git diff --numstat base...head`. No truncation,
+no rate limits, and deterministic output for any range.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+
+
+# git --name-status letters -> GitHub compare file statuses
+FILE_STATUSES = {'A': 'added', 'D': 'removed', 'M': 'modified', 'R': 'renamed', 'C': 'copied', 'T': 'changed'}
+
+
+def run_git(repo_path: str, *args: str, env: dict = None) -> str:
+    """Run a git command in repo_path and return its stdout; `env` adds environment variables"""
+    result = subprocess.run(
+        ['git', '-C', str(repo_path), *args],
+        capture_output=True, text=True, errors='replace', check=True,
+        env={**os.environ, **env} if env else None
+    )
+    return result.stdout
+
+
+def resolve_ref(repo_path: str, ref: str) -> str:
+    """Resolve a branch/tag name to a commit SHA, also trying the origin/ remote-tracking name"""
+    for candidate in (ref, f'origin/{ref}', f'refs/tags/{ref}'):
+        result = subprocess.run(
+            ['git', '-C', str(repo_path), 'rev-parse', '--verify', '--quiet', f'{candidate}^{{commit}}'],
+            capture_output=True, text=True
+        )
+        if result.returncode == 0:
+            return result.stdout.strip()
+    raise ValueError(f"Ref not found in {repo_path}: {ref}")
+
+
+def tracked_files(repo_path: str, head_sha: str) -> set:
+    """Every path in head's tree"""
+    return {path for path in run_git(repo_path, 'ls-tree', '-r', '-z', '--name-only', head_sha).split('\x00') if path}
+
+
+def iter_local_commits(repo_path: str, base_sha: str, head_sha: str):
+    """Yield commits in base..head, oldest first, shaped like GitHub compare commits"""
+    # NUL between fields, RS between records: messages may contain anything else
+    log = run_git(repo_path, 'log', '--reverse', '--format=%H%x00%an%x00%aI%x00%B%x1e', f'{base_sha}..{head_sha}')
+    for record in log.split('\x1e'):
+        record = record.lstrip('\n')
+        if not record:
+            continue
+        sha, author, date, message = record.split('\x00', 3)
+        yield {
+            'sha': sha,
+            'commit': {
+                'message': message.rstrip('\n'),
+                'author': {'name': author, 'date': date},
+            },
+        }
+
+
+def local_file_statuses(repo_path: str, base_sha: str, head_sha: str) -> dict:
+    """{path: GitHub-style status} for the merge-base diff"""
+    fields = run_git(repo_path, 'diff', '--name-status', '-z', '-M', f'{base_sha}...{head_sha}').split('\x00')
+    statuses = {}
+    i = 0
+    while i < len(fields) - 1:
+        letter = fields[i][:1]
+        # Renames and copies are "R100\0old\0new\0", everything else "M\0path\0"
+        i += 3 if letter in 'RC' else 2
+        statuses[fields[i - 1]] = FILE_STATUSES.get(letter, 'modified')
+    return statuses
+
+
+def local_file_changes(repo_path: str, base_sha: str, head_sha: str) -> list:
+    """Per-file churn for the merge-base diff, shaped like GitHub compare files"""
+    # Three dots diff against the merge base, which is what GitHub's compare shows
+    output = run_git(repo_path, 'diff', '--numstat', '-z', '-M', f'{base_sha}...{head_sha}')
+    statuses = local_file_statuses(repo_path, base_sha, head_sha)
+    fields = output.split('\x00')
+
+    files = []
+    i = 0
+    while i < len(fields) - 1:
+        additions, deletions, path = fields[i].split('\t', 2)
+        i += 1
+        previous_filename = None
+        if path == '':
+            # Renames are "adds\tdels\t\0old\0new\0" with -z
+            previous_filename, path = fields[i], fields[i + 1]
+            i += 2
+
+        binary = additions == '-'
+        file_info = {
+            'filename': path,
+            'additions': 0 if binary else int(additions),
+            'deletions': 0 if binary else int(deletions),
+            'status': 'renamed' if previous_filename else statuses.get(path, 'modified'),
+        }
+        file_info['changes'] = file_info['additions'] + file_info['deletions']
+        if previous_filename:
+            file_info['previous_filename'] = previous_filename
+        files.append(file_info)
+
+    return files
+
+
+def local_patches(repo_path: str, base_sha: str, head_sha: str) -> dict:
+    """Unified diff hunks per file for the merge-base diff, keyed by filename"""
+    diff = run_git(repo_path, 'diff', '-M', '--no-color', f'{base_sha}...{head_sha}')
+
+    patches = {}
+    filename = None
+    old_filename = None
+    hunks = []
+    for line in diff.splitlines(keepends=True):
+        if line.startswith('diff --git '):
+            if filename is not None:
+                patches[filename] = ''.join(hunks)
+            filename, old_filename, hunks = None, None, []
+        elif line.startswith('--- ') and not hunks:
+            source = line[4:].rstrip('\n')
+            old_filename = source[2:] if source.startswith('a/') else None
+        elif line.startswith('+++ ') and not hunks:
+            target = line[4:].rstrip('\n')
+            # Deleted files diff against /dev/null; GitHub keys them by the old name
+            filename = target[2:] if target.startswith('b/') else old_filename
+        elif line.startswith('@@') or hunks:
+            hunks.append(line)
+    if filename is not None:
+        patches[filename] = ''.join(hunks)
+
+    return patches
+
+
+def iter_local_compare(repo_path: str, base: str, head: str, include_patches: bool = False):
+    """Stream a local range as the same ('summary'|'commit'|'file', item) events as iter_compare"""
+    if not Path(repo_path).exists():
+        raise FileNotFoundError(f"Local repository not found: {repo_path}")
+
+    base_sha = resolve_ref(repo_path, base)
+    head_sha = resolve_ref(repo_path, head)
+
+    files = local_file_changes(repo_path, base_sha, head_sha)
+    if include_patches:
+        patches = local_patches(repo_path, base_sha, head_sha)
+        for file_info in files:
+            if file_info['filename'] in patches:
+                file_info['patch'] = patches[file_info['filename']]
+
+    total_commits = int(run_git(repo_path, 'rev-list', '--count', f'{base_sha}..{head_sha}'))
+    yield 'summary', {'total_commits': total_commits, 'files': files}
+
+    for commit in iter_local_commits(repo_path, base_sha, head_sha):
+        yield 'commit', commit
+
+    for file_info in files:
+        yield 'file', file_info
@@ -0,0 +1,105 @@
+"""
+Bare mirror manager for tracked repos
+
+Keeps one bare clone per repo under a mirror root and, on each run,
+fetches only the tracked refs (main, release/*, tags) so the local git
+changelog source is always warm. The first run initialises the mirror with
+the same narrow refspecs instead of a full clone; later runs only pay for
+new objects. Every sync is timed and appended to a small JSON log.
+"""
+
+import base64
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+from local_git import run_git
+
+
+DEFAULT_MIRROR_ROOT = '.cache/mirrors'
+DEFAULT_TRACKED_REFS = ['main', 'release/*']
+DEFAULT_REMOTE_URL = 'https://github.com/{owner}/{repo}.git'
+MAX_TIMING_ENTRIES = 200
+
+
+class MirrorManager:
+    """One incrementally-fetched bare mirror per tracked GitHub repo"""
+
+    def __init__(self, root: str = DEFAULT_MIRROR_ROOT, github_token: str = None,
+                 tracked_refs: list = None, remote_url: str = DEFAULT_REMOTE_URL):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.github_token = github_token
+        self.tracked_refs = tracked_refs or DEFAULT_TRACKED_REFS
+        self.remote_url = remote_url
+        self.timings_path = self.root / 'fetch_timings.json'
+
+    def mirror_path(self, owner: str, repo: str) -> Path:
+        return self.root / owner / f'{repo}.git'
+
+    def _git(self, path: Path, *args: str) -> str:
+        # Pass the token per command through the environment, so it never ends
+        # up in the mirror's config or in the argv other processes can read
+        env = None
+        if self.github_token:
+            credentials = base64.b64encode(f'x-access-token:{self.github_token}'.encode()).decode()
+            env = {
+                'GIT_CONFIG_COUNT': '1',
+                'GIT_CONFIG_KEY_0': 'http.extraHeader',
+                'GIT_CONFIG_VALUE_0': f'Authorization: Basic {credentials}',
+            }
+        return run_git(path, *args, env=env)
+
+    def _refspecs(self, path: Path) -> list:
+        """Refspecs for the tracked refs; exact branch names that don't exist upstream are skipped"""
+        exact = [ref for ref in self.tracked_refs if '*' not in ref]
+        existing = set()
+        if exact:
+            listing = self._git(path, 'ls-remote', '--heads', 'origin', *exact)
+            existing = {line.split('\t', 1)[1][len('refs/heads/'):] for line in listing.splitlines() if '\t' in line}
+
+        refspecs = [f'+refs/heads/{ref}:refs/heads/{ref}' for ref in self.tracked_refs
+                    if '*' in ref or ref in existing]
+        refspecs.append('+refs/tags/*:refs/tags/*')
+        return refspecs
+
+    def _init_mirror(self, path: Path, owner: str, repo: str):
+        path.mkdir(parents=True, exist_ok=True)
+        run_git(path, 'init', '--bare', '--quiet')
+        run_git(path, 'config', 'remote.origin.url', self.remote_url.format(owner=owner, repo=repo))
+
+    def sync(self, owner: str, repo: str, prune: bool = True) -> Path:
+        """Create the mirror if needed, fetch new tracked refs, and return its path"""
+        path = self.mirror_path(owner, repo)
+        action = 'fetch'
+        if not (path / 'HEAD').exists():
+            print(f"   🪞 Initialising mirror for {owner}/{repo} at {path}...")
+            self._init_mirror(path, owner, repo)
+            action = 'init'
+
+        start = time.perf_counter()
+        fetch_args = ['fetch', '--quiet', '--no-write-fetch-head']
+        if prune:
+            fetch_args.append('--prune')
+        self._git(path, *fetch_args, 'origin', *self._refspecs(path))
+        # Repack only when loose objects pile up
+        run_git(path, 'gc', '--auto', '--quiet')
+        elapsed = time.perf_counter() - start
+
+        self._record_timing(owner, repo, action, elapsed)
+        print(f"   ✅ Mirror {owner}/{repo} {'initialised' if action == 'init' else 'updated'} in {elapsed:.1f}s")
+        return path
+
+    def _record_timing(self, owner: str, repo: str, action: str, seconds: float):
+        try:
+            timings = json.loads(self.timings_path.read_text())
+        except (OSError, ValueError):
+            timings = []
+        timings.append({
+            'repo': f'{owner}/{repo}',
+            'action': action,
+            'seconds': round(seconds, 3),
+            'at': datetime.now().isoformat(timespec='seconds'),
+        })
+        self.timings_path.write_text(json.dumps(timings[-MAX_TIMING_ENTRIES:], indent=2))
@@ -0,0 +1,80 @@
+"""
+Cherry-pick detection by patch fingerprint
+
+RC branches carry cherry-picks of the same change under different SHAs.
+Like `git patch-id`, a fingerprint hashes what a commit changes while
+ignoring line numbers and whitespace, so a cherry-pick gets the same
+fingerprint as its original. Fingerprints come from a local clone (real
+`git patch-id --stable`) or from per-commit patches fetched from GitHub,
+and commits sharing one collapse into a single changelog entry.
+"""
+
+import hashlib
+import subprocess
+
+from fetch_engine import AsyncFetchEngine
+
+
+# Commit-store analysis keys: the two fingerprints hash differently, so a
+# SHA fingerprinted one way must not be compared with one done the other way
+GIT_PATCH_ID_KEY = 'patch_id:git'
+GITHUB_PATCH_ID_KEY = 'patch_id:github'
+
+
+def local_patch_ids(repo_path: str, shas: list) -> dict:
+    """{sha: patch id} via git patch-id; merge commits and empty commits map to None"""
+    log = subprocess.run(
+        ['git', '-C', str(repo_path), 'log', '--no-walk=unsorted', '--stdin', '-p', '--no-color', '--format=commit %H'],
+        input='\n'.join(shas) + '\n', capture_output=True, text=True, errors='replace', check=True
+    )
+    patch_ids = subprocess.run(
+        ['git', '-C', str(repo_path), 'patch-id', '--stable'],
+        input=log.stdout, capture_output=True, text=True, check=True
+    )
+    results = {sha: None for sha in shas}
+    for line in patch_ids.stdout.splitlines():
+        patch_id, sha = line.split()
+        results[sha] = patch_id
+    return results
+
+
+def fingerprint_files(files: list):
+    """patch-id style fingerprint of a GitHub commit's `files` (filename + changed lines, whitespace-stripped)"""
+    digest = hashlib.sha1()
+    changed = False
+    for file_info in sorted(files, key=lambda f: f['filename']):
+        digest.update(file_info['filename'].encode() + b'\0')
+        for line in (file_info.get('patch') or '').splitlines():
+            if line[:1] and line[0] in '+-':
+                digest.update(line[0].encode() + ''.join(line[1:].split()).encode() + b'\n')
+                changed = True
+    return digest.hexdigest() if changed else None
+
+
+def github_patch_ids(engine: AsyncFetchEngine, owner: str, repo: str, shas: list) -> dict:
+    """{sha: fingerprint} from per-commit details fetched concurrently (immutable, so cached)"""
+    print(f"   🧬 Fingerprinting {len(shas)} commits...")
+    details = engine.fetch_all([f"/repos/{owner}/{repo}/commits/{sha}" for sha in shas])
+    results = {}
+    for sha, detail in zip(shas, details):
+        # Merges have two parents and their files are the combined diff; never collapse them
+        if detail and len(detail.get('parents', [])) <= 1:
+            results[sha] = fingerprint_files(detail.get('files', []))
+        elif detail:
+            results[sha] = None
+    return results
+
+
+def group_duplicates(shas: list, patch_ids: dict) -> dict:
+    """{kept sha: [later shas with the same fingerprint]}; the first (oldest) occurrence is kept"""
+    first_by_id = {}
+    groups = {}
+    for sha in shas:
+        patch_id = patch_ids.get(sha)
+        if patch_id is None or patch_id not in first_by_id:
+            if patch_id is not None:
+                first_by_id[patch_id] = sha
+            groups[sha] = []
+        else:
+            groups[first_by_id[patch_id]].append(sha)
+    return groups
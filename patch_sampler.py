@@ -0,0 +1,164 @@
+"""
+Budgeted patch sampling for the riskiest files
+
+The prompt used to carry only filenames and +/- counts. This module ranks
+changed files by risk (churn weighted by path rules), makes sure the top
+files have a unified diff (fetching base/head contents concurrently when
+GitHub left the patch out), then picks the most informative hunks that fit
+a token budget instead of pasting a whole 134-file diff.
+"""
+
+import difflib
+import math
+import re
+from urllib.parse import quote
+
+from fetch_engine import AsyncFetchEngine
+
+
+DEFAULT_PATCH_BUDGET_TOKENS = 6000
+DEFAULT_PATCH_FILES = 15
+CHARS_PER_TOKEN = 4
+MAX_HUNK_LINES = 80
+
+# (pattern, weight) - first match wins, unmatched paths weigh 1.0
+PATH_RISK_RULES = [
+    (r'(^|/)(schemas|migrations?)/|Migration\w*\.kt$', 3.0),
+    (r'AndroidManifest\.xml$', 2.5),
+    (r'\.gradle(\.kts)?$|(^|/)gradle/.*\.toml$', 2.0),
+    (r'(^|/)(di|network|api|db|database|auth|billing|payment)s?/', 1.8),
+    (r'\.(kt|java|swift)$', 1.2),
+    (r'(^|/)(test|androidTest|testFixtures)/|Test\.kt$', 0.4),
+    (r'(^|/)values(-[\w-]+)?/strings\.xml$|\.lproj/', 0.1),
+    (r'\.(png|jpg|webp|svg|json|lock)$', 0.1),
+]
+_COMPILED_RULES = [(re.compile(pattern), weight) for pattern, weight in PATH_RISK_RULES]
+
+# Hunks touching these look like behaviour, not formatting
+INFORMATIVE_LINE = re.compile(
+    r'\b(if|else|when|return|throw|catch|try|suspend|launch|synchronized|lock|'
+    r'fun|class|override|@Query|@Entity|@Database|Migration|version|permission)\b'
+)
+TRIVIAL_LINE = re.compile(r'^[+-]\s*(import\s|package\s|//|\*|/\*|$)')
+
+
+def path_weight(filename: str) -> float:
+    for pattern, weight in _COMPILED_RULES:
+        if pattern.search(filename):
+            return weight
+    return 1.0
+
+
+def file_risk_score(file_info: dict) -> float:
+    """Churn, log-damped, scaled by the path-rule weight"""
+    churn = file_info.get('changes') or file_info.get('additions', 0) + file_info.get('deletions', 0)
+    return path_weight(file_info['filename']) * math.log1p(churn)
+
+
+def rank_files_by_risk(files: list, score=file_risk_score) -> list:
+    return sorted(files, key=score, reverse=True)
+
+
+def split_hunks(patch: str) -> list:
+    """Split a unified diff body into its @@ hunks"""
+    hunks = []
+    for line in patch.splitlines(keepends=True):
+        if line.startswith('@@') or not hunks:
+            hunks.append([])
+        hunks[-1].append(line)
+    return [''.join(lines) for lines in hunks if lines]
+
+
+def hunk_score(hunk: str) -> float:
+    """How much a hunk is likely to tell the reader about intent"""
+    changed = [line for line in hunk.splitlines() if line[:1] in '+-' and not line.startswith(('+++', '---'))]
+    if not changed:
+        return 0.0
+    meaningful = [line for line in changed if not TRIVIAL_LINE.match(line)]
+    informative = sum(1 for line in meaningful if INFORMATIVE_LINE.search(line))
+    return len(meaningful) + 3 * informative
+
+
+def trim_hunk(hunk: str, max_lines: int = MAX_HUNK_LINES) -> str:
+    lines = hunk.splitlines(keepends=True)
+    if len(lines) <= max_lines:
+        return hunk
+    return ''.join(lines[:max_lines]) + f"... ({len(lines) - max_lines} more lines)\n"
+
+
+def select_hunks(files: list, budget_tokens: int, score=file_risk_score) -> tuple:
+    """Greedily pick the best (file risk x hunk score) per token hunks that fit the budget
+
+    `score(file_info)` is the file risk. Returns ({filename: [hunks in
+    original order]}, number of hunks left out).
+    """
+    candidates = []
+    for file_rank, file_info in enumerate(files):
+        risk = score(file_info) or 0.1
+        for position, hunk in enumerate(split_hunks(file_info.get('patch') or '')):
+            hunk = trim_hunk(hunk)
+            informative = hunk_score(hunk)
+            if informative <= 0:
+                continue
+            cost = len(hunk) / CHARS_PER_TOKEN + 1
+            candidates.append((risk * informative / cost, file_rank, position, hunk, cost))
+
+    budget = float(budget_tokens)
+    selected = {}
+    skipped = 0
+    for _, file_rank, position, hunk, cost in sorted(candidates, key=lambda c: c[0], reverse=True):
+        if cost > budget:
+            skipped += 1
+            continue
+        budget -= cost
+        selected.setdefault(file_rank, []).append((position, hunk))
+
+    hunks_by_file = {}
+    for file_rank in sorted(selected):
+        hunks_by_file[files[file_rank]['filename']] = [hunk for _, hunk in sorted(selected[file_rank])]
+    return hunks_by_file, skipped
+
+
+def fetch_missing_patches(engine: AsyncFetchEngine, owner: str, repo: str, base_sha: str, head_sha: str,
+                          files: list):
+    """Fill in 'patch' for files GitHub omitted it on, by diffing base/head contents fetched concurrently"""
+    missing = [f for f in files if not f.get('patch') and f.get('status') != 'renamed']
+    if not missing:
+        return
+
+    paths = []
+    for file_info in missing:
+        filename = quote(file_info['filename'])
+        paths.append(None if file_info.get('status') == 'added' else
+                     f"/repos/{owner}/{repo}/contents/{filename}?ref={base_sha}")
+        paths.append(None if file_info.get('status') == 'removed' else
+                     f"/repos/{owner}/{repo}/contents/{filename}?ref={head_sha}")
+
+    print(f"   🔎 Fetching contents for {len(missing)} large diffs...")
+    results = engine.fetch_all([path for path in paths if path], fetch=engine.client.get_raw)
+    contents = iter(results)
+    resolved = [next(contents) if path else '' for path in paths]
+
+    for i, file_info in enumerate(missing):
+        before, after = resolved[i * 2], resolved[i * 2 + 1]
+        if before is None or after is None or '\x00' in before or '\x00' in after:
+            continue
+        diff = difflib.unified_diff(before.splitlines(keepends=True), after.splitlines(keepends=True), n=3)
+        # Drop the ---/+++ header, keep the hunks like GitHub's patch field
+        file_info['patch'] = ''.join(line if line.endswith('\n') else line + '\n' for line in list(diff)[2:])
+
+
+def render_patch_section(files: list, budget_tokens: int, score=file_risk_score) -> str:
+    """The '=== KEY PATCHES ===' changelog section for already-ranked files"""
+    hunks_by_file, skipped = select_hunks(files, budget_tokens, score)
+    if not hunks_by_file:
+        return ''
+
+    section = f"\n=== KEY PATCHES (highest-risk files, ~{budget_tokens} token budget) ===\n\n"
+    for filename, hunks in hunks_by_file.items():
+        section += f"--- {filename}\n"
+        section += ''.join(hunks)
+        section += "\n"
+    if skipped:
+        section += f"... {skipped} lower-signal hunks omitted to stay within budget\n"
+    return section
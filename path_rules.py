@@ -0,0 +1,88 @@
+"""
+Path classification for changed files
+
+Most of an Android RC's file list is locale string updates, lockfiles and
+generated sources. Configurable glob rules are compiled into a single
+regex with one named group per class, so each path is classified in one
+match instead of a loop over every glob. Low-signal classes are collapsed
+into summary lines so they stop using up the changelog's file slots.
+"""
+
+import json
+import re
+
+
+# class -> globs, checked in order; `**/` spans directories, `*` and `?` do not
+DEFAULT_PATH_RULES = {
+    'generated': [
+        '**/build/**', '**/generated/**', '**/*.g.kt', '**/*_Factory.java', '**/*_Impl.kt',
+        '**/R.java', '**/BuildConfig.java', '**/*.lock', '**/*.lockfile', '**/package-lock.json',
+    ],
+    'vendored': ['**/vendor/**', '**/third_party/**', '**/third-party/**', '**/Pods/**'],
+    'locale': [
+        '**/values-*/strings.xml', '**/values-*/plurals.xml', '**/*.lproj/*.strings',
+        '**/*.lproj/*.stringsdict', '**/locales/**/*.json', '**/i18n/**',
+    ],
+    'build': [
+        '**/*.gradle', '**/*.gradle.kts', '**/gradle/**', '**/gradle.properties',
+        '**/proguard-*.pro', '**/*.podspec', '**/Podfile', '**/.github/**',
+    ],
+    'test': ['**/src/test/**', '**/src/androidTest/**', '**/src/testFixtures/**', '**/*Test.kt', '**/*Tests.swift'],
+}
+DEFAULT_CLASS = 'source'
+
+# Collapsed into one summary line per class in the changelog; everything else is listed file by file
+LOW_SIGNAL_CLASSES = ('generated', 'vendored', 'locale')
+
+
+def glob_to_regex(glob: str) -> str:
+    parts = []
+    i = 0
+    while i < len(glob):
+        if glob.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif glob.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif glob[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif glob[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        else:
+            parts.append(re.escape(glob[i]))
+            i += 1
+    return ''.join(parts)
+
+
+class PathClassifier:
+    """Classifies paths against {class: [globs]} rules with one compiled regex"""
+
+    def __init__(self, rules: dict = None):
+        self.rules = rules or DEFAULT_PATH_RULES
+        alternatives = []
+        for name, globs in self.rules.items():
+            if not re.fullmatch(r'[A-Za-z_]\w*', name):
+                raise ValueError(f"Path class names must be identifiers: {name!r}")
+            alternatives.append(f"(?P<{name}>{'|'.join(glob_to_regex(glob) for glob in globs)})")
+        self.pattern = re.compile('|'.join(alternatives))
+
+    def classify(self, path: str) -> str:
+        match = self.pattern.fullmatch(path)
+        return match.lastgroup if match else DEFAULT_CLASS
+
+    @classmethod
+    def from_file(cls, path: str):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+
+def summarize_collapsed(collapsed: dict) -> list:
+    """Changelog lines for {class: {'files', 'additions', 'deletions', 'examples'}} totals"""
+    lines = ["\n=== LOW-SIGNAL FILES (collapsed) ===\n\n"]
+    for name, totals in collapsed.items():
+        lines.append(f"{name}: {totals['files']} files, +{totals['additions']} -{totals['deletions']}"
+                     f" (e.g. {', '.join(totals['examples'])})\n")
+    return lines
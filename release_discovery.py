@@ -0,0 +1,122 @@
+"""
+Release-branch discovery and automatic compare-range resolution
+
+Lists release/* branches and tags (from the GitHub API, paginated and
+cached with conditional requests, or from a local mirror), semver-sorts
+them into an index, and picks the latest release and its predecessor so
+scheduled runs only need `--repo owner/name`.
+"""
+
+import re
+
+from github_client import GitHubClient
+from local_git import run_git
+
+
+RELEASE_BRANCH_PREFIX = 'release/'
+
+VERSION_PATTERN = re.compile(r'(\d+)\.(\d+)(?:\.(\d+))?(?:[-.]?(alpha|beta|rc)[-.]?(\d+)?)?', re.IGNORECASE)
+# Pre-releases sort before the final release of the same version
+PRERELEASE_RANK = {'alpha': 0, 'beta': 1, 'rc': 2, None: 3}
+
+
+def parse_version(name: str):
+    """Sortable version tuple for a ref name like release/4.33.0 or v4.33.0-rc2, or None"""
+    match = VERSION_PATTERN.search(name)
+    if not match:
+        return None
+    major, minor, patch, pre, pre_number = match.groups()
+    pre = pre.lower() if pre else None
+    return (int(major), int(minor), int(patch or 0), PRERELEASE_RANK[pre], int(pre_number or 0))
+
+
+def format_version(version: tuple) -> str:
+    major, minor, patch, pre_rank, pre_number = version
+    text = f"{major}.{minor}.{patch}"
+    if pre_rank != PRERELEASE_RANK[None]:
+        pre = next(name for name, rank in PRERELEASE_RANK.items() if rank == pre_rank)
+        text += f"-{pre}{pre_number or ''}"
+    return text
+
+
+def build_release_index(refs: list) -> list:
+    """Keep refs with a parseable version and sort them oldest to newest
+
+    `refs` are dicts with 'name' (branch or tag name), 'kind' ('branch' or
+    'tag') and 'sha'; each indexed entry gains a 'version' tuple.
+    """
+    index = []
+    for ref in refs:
+        version = parse_version(ref['name'])
+        if version is not None:
+            index.append(dict(ref, version=version))
+    index.sort(key=lambda ref: (ref['version'], ref['kind'] == 'branch'))
+    return index
+
+
+def list_github_release_refs(client: GitHubClient, owner: str, repo: str,
+                             prefix: str = RELEASE_BRANCH_PREFIX) -> list:
+    """Release branches and all tags from the GitHub matching-refs API"""
+    refs = []
+    for ref in client.iter_paginated(f"/repos/{owner}/{repo}/git/matching-refs/heads/{prefix}"):
+        refs.append({'name': ref['ref'][len('refs/heads/'):], 'kind': 'branch', 'sha': ref['object']['sha']})
+    for ref in client.iter_paginated(f"/repos/{owner}/{repo}/git/matching-refs/tags/"):
+        refs.append({'name': ref['ref'][len('refs/tags/'):], 'kind': 'tag', 'sha': ref['object']['sha']})
+    return refs
+
+
+def list_local_release_refs(repo_path: str, prefix: str = RELEASE_BRANCH_PREFIX) -> list:
+    """Release branches and all tags from a local clone or mirror"""
+    output = run_git(repo_path, 'for-each-ref', '--format=%(refname)%00%(objectname)',
+                     f'refs/heads/{prefix}', f'refs/remotes/origin/{prefix}', 'refs/tags/')
+    refs = []
+    seen = set()
+    for line in output.splitlines():
+        refname, sha = line.split('\x00')
+        for namespace, kind in (('refs/heads/', 'branch'), ('refs/remotes/origin/', 'branch'), ('refs/tags/', 'tag')):
+            if refname.startswith(namespace):
+                name = refname[len(namespace):]
+                if (name, kind) not in seen:
+                    seen.add((name, kind))
+                    refs.append({'name': name, 'kind': kind, 'sha': sha})
+                break
+    return refs
+
+
+def resolve_latest_range(index: list):
+    """(base, head, version) for the newest release and the one before it
+
+    Release branches are preferred; tags are only used when the repo has no
+    versioned release branches. A hotfix (4.33.1) compares against its
+    previous version (4.33.0). Pre-releases of the head's own version
+    (4.33.0-rc2 for 4.33.0) are skipped, so the base is the previous release.
+    """
+    branches = [ref for ref in index if ref['kind'] == 'branch']
+    candidates = branches or [ref for ref in index if ref['kind'] == 'tag']
+    if not candidates:
+        raise ValueError("No versioned release branches or tags found")
+
+    head = candidates[-1]
+    older = [ref for ref in candidates
+             if ref['version'] < head['version'] and ref['version'][:3] != head['version'][:3]]
+    if not older:
+        raise ValueError(f"No release older than {head['name']} to compare against")
+    base = older[-1]
+    return base['name'], head['name'], format_version(head['version'])
+
+
+def print_release_index(index: list, limit: int = 5):
+    print(f"   📚 Release index: {len(index)} versioned refs")
+    for ref in index[-limit:]:
+        print(f"      {format_version(ref['version']):<14} {ref['kind']:<6} {ref['name']} ({ref['sha'][:7]})")
+
+
+def discover_latest_range(owner: str, repo: str, client: GitHubClient = None, repo_path: str = None):
+    """(base, head, version) of the latest release range, from a local mirror if given, else GitHub"""
+    if repo_path:
+        refs = list_local_release_refs(repo_path)
+    else:
+        refs = list_github_release_refs(client, owner, repo)
+    index = build_release_index(refs)
+    print_release_index(index)
+    return resolve_latest_range(index)
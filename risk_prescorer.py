@@ -0,0 +1,156 @@
+"""
+Heuristic risk pre-scoring without an LLM call
+
+Ranks the modules a release touches by a fixed formula over every
+changed file, so the prompt can point Claude at the likely hot spots and
+the dashboard can show a preliminary risk level before Claude answers.
+
+Per module, in one pass over the release's files and commits:
+- weighted churn: sum over its files of log1p(+/-) times the file's
+  path-rule weight (migrations, Room schemas, manifest and Gradle files
+  weigh most, locale strings and assets least)
+- untested: source files changed with no test file changed alongside
+- mentions: commits whose message names the module (a proxy for how
+  many PRs touched it; the compare data has no per-commit file lists)
+- late mentions: the same, for commits that landed in the last part of
+  the release window
+
+Feature columns are kept in stdlib `array` buffers rather than NumPy,
+which this project doesn't depend on; a release has at most a few
+hundred modules, so the arithmetic is not the bottleneck.
+"""
+
+import html
+import math
+import re
+from array import array
+from datetime import datetime
+
+from churn_rollup import PathTrie
+from patch_sampler import path_weight
+from path_rules import PathClassifier
+
+
+# Commits in the last quarter of the release window count as late-landing
+LATE_WINDOW_FRACTION = 0.25
+UNTESTED_FACTOR = 0.5
+MENTION_FACTOR = 0.15
+LATE_FACTOR = 0.5
+
+# (minimum top-module score, level) - highest threshold first
+RISK_LEVEL_THRESHOLDS = [(18.0, 'HIGH'), (10.0, 'MEDIUM-HIGH'), (4.0, 'MEDIUM'), (0.0, 'LOW')]
+MAX_PRESCORED_MODULES = 10
+
+
+def _parse_date(text: str):
+    try:
+        return datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+
+
+def late_commit_flags(commits: list) -> list:
+    """Whether each commit landed in the last LATE_WINDOW_FRACTION of the range's time span"""
+    dates = [_parse_date(commit.date) for commit in commits]
+    known = [date for date in dates if date is not None]
+    if len(known) < 2:
+        return [False] * len(commits)
+    start, end = min(known), max(known)
+    cutoff = end - (end - start) * LATE_WINDOW_FRACTION
+    return [date is not None and date > cutoff for date in dates]
+
+
+def prescore_release(release, churn_trie: PathTrie = None, classifier: PathClassifier = None) -> list:
+    """Modules ranked by heuristic risk: [{'module', 'score', 'reasons', ...}], highest first"""
+    if churn_trie is None:
+        churn_trie = PathTrie()
+        for change in release.files:
+            churn_trie.insert(change.filename, change.additions, change.deletions)
+    classifier = classifier or PathClassifier()
+
+    index = {}
+    file_modules = []
+    for change in release.files:
+        module = churn_trie.module_of(change.filename)
+        file_modules.append(index.setdefault(module, len(index)))
+
+    count = len(index)
+    churn = array('d', [0.0]) * count
+    weighted_churn = array('d', [0.0]) * count
+    weight = array('d', [0.0]) * count
+    source_files = array('l', [0]) * count
+    test_files = array('l', [0]) * count
+    mentions = array('l', [0]) * count
+    late_mentions = array('l', [0]) * count
+    heaviest = [''] * count
+
+    for change, i in zip(release.files, file_modules):
+        file_churn = math.log1p(change.additions + change.deletions)
+        file_weight = path_weight(change.filename)
+        churn[i] += file_churn
+        weighted_churn[i] += file_weight * file_churn
+        if file_weight > weight[i]:
+            weight[i] = file_weight
+            heaviest[i] = change.filename
+        file_class = classifier.classify(change.filename)
+        source_files[i] += file_class == 'source'
+        test_files[i] += file_class == 'test'
+
+    names = [(i, re.compile(rf'\b{re.escape(module.rsplit("/", 1)[-1])}\b', re.IGNORECASE))
+             for module, i in index.items() if len(module.rsplit('/', 1)[-1]) >= 4]
+    for commit, late in zip(release.commits, late_commit_flags(release.commits)):
+        for i, pattern in names:
+            if pattern.search(commit.message):
+                mentions[i] += 1
+                late_mentions[i] += late
+
+    ranked = []
+    for module, i in index.items():
+        untested = source_files[i] > 0 and test_files[i] == 0
+        score = (weighted_churn[i] * (1 + UNTESTED_FACTOR * untested)
+                 * (1 + MENTION_FACTOR * mentions[i]) * (1 + LATE_FACTOR * (late_mentions[i] > 0)))
+        reasons = [f"churn {churn[i]:.1f}"]
+        if weight[i] >= 2.0:
+            reasons.append(f"high-risk path ({heaviest[i].rsplit('/', 1)[-1]})")
+        if untested:
+            reasons.append("no test changes")
+        if mentions[i]:
+            reasons.append(f"named in {mentions[i]} commits")
+        if late_mentions[i]:
+            reasons.append(f"{late_mentions[i]} late-landing")
+        ranked.append({'module': module, 'score': score, 'reasons': reasons})
+    ranked.sort(key=lambda row: row['score'], reverse=True)
+    return ranked
+
+
+def preliminary_risk_level(ranked: list) -> str:
+    top = ranked[0]['score'] if ranked else 0.0
+    for threshold, level in RISK_LEVEL_THRESHOLDS:
+        if top >= threshold:
+            return level
+    return 'LOW'
+
+
+def render_prescore_lines(ranked: list, level: str, limit: int = MAX_PRESCORED_MODULES) -> list:
+    """Prompt section with the preliminary level and the top-ranked modules"""
+    lines = [f"=== HEURISTIC PRE-SCORE (no LLM; preliminary level {level}) ===\n",
+             "Modules ranked by churn, path rules, missing tests and late commits - review these first:\n\n"]
+    for row in ranked[:limit]:
+        lines.append(f"{row['score']:6.1f}  {row['module']}: {', '.join(row['reasons'])}\n")
+    lines.append("\n")
+    return lines
+
+
+def render_prescore_html(ranked: list, level: str, limit: int = MAX_PRESCORED_MODULES) -> str:
+    """Report-page table of the same ranking"""
+    cells = ''.join(
+        f'''
+                <tr><td>{row['score']:.1f}</td><td>{html.escape(row['module'])}</td>'''
+        f'''<td>{html.escape(', '.join(row['reasons']))}</td></tr>'''
+        for row in ranked[:limit]
+    )
+    return f'''
+            <div class="risk-item-description">Preliminary level before Claude's review: <strong>{level}</strong></div>
+            <table style="width: 100%; font-size: 12px; border-collapse: collapse;">
+                <tr style="text-align: left; color: #787774;"><th>Score</th><th>Module</th><th>Why</th></tr>{cells}
+            </table>'''
@@ -0,0 +1,9 @@
+import sys
+from pathlib import Path
+
+# The modules live flat at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'backlog(request_id): the backlog request whose behaviour a test covers')
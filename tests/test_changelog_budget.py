@@ -0,0 +1,113 @@
+import pytest
+
+from changelog_budget import compact_changelog, estimate_tokens, truncate_message
+from patch_sampler import CHARS_PER_TOKEN
+from weekly_automation_with_fetch import iter_changelog
+
+
+pytestmark = pytest.mark.backlog('user-018')
+
+
+def render_commit(commit, message):
+    return f"{commit[0]}: {message}\n"
+
+
+def render_file(file_info):
+    return f"{file_info['filename']}\n"
+
+
+def commit(sha, message):
+    return (sha, 'Dev', '2026-01-01T00:00:00Z', message)
+
+
+def total_chars(commit_blocks, file_blocks):
+    return sum(map(len, commit_blocks)) + sum(map(len, file_blocks))
+
+
+def test_everything_is_kept_when_it_fits():
+    commits = [commit('a1', 'Merge pull request #1 from x/y'), commit('a2', 'Fix crash')]
+    files = [{'filename': 'app/res/values-de/strings.xml'}, {'filename': 'app/Foo.kt'}]
+    commit_blocks, file_blocks, elided = compact_changelog(commits, files, render_commit, render_file, 1000)
+    assert len(commit_blocks) == 2 and len(file_blocks) == 2 and elided == []
+
+
+def test_low_signal_entries_go_first():
+    commits = [commit('m1', 'Merge pull request #1 from x/y'), commit('v1', 'Bump version to 4.33.0'),
+               commit('c1', 'Fix crash in lesson player')]
+    files = [{'filename': 'app/src/main/res/values-de/strings.xml'}, {'filename': 'app/Foo.kt'}]
+    budget = len(render_commit(commits[2], commits[2][3]) + render_file(files[1])) // CHARS_PER_TOKEN + 1
+
+    commit_blocks, file_blocks, elided = compact_changelog(commits, files, render_commit, render_file, budget)
+    assert commit_blocks == ['c1: Fix crash in lesson player\n']
+    assert file_blocks == ['app/Foo.kt\n']
+    assert elided == ['1 merge commits', '1 version-bump commits', '1 locale files']
+
+
+def test_locale_detection_follows_the_classifier():
+    from path_rules import PathClassifier
+    files = [{'filename': 'translations/de.po'}, {'filename': 'app/Foo.kt'}]
+    classifier = PathClassifier({'locale': ['translations/*.po']})
+    _, file_blocks, elided = compact_changelog([], files, render_commit, render_file, 4, classifier=classifier)
+    assert file_blocks == ['app/Foo.kt\n'] and elided == ['1 locale files']
+
+
+def test_files_are_cut_before_commit_messages():
+    commits = [commit('c1', 'Fix crash')]
+    files = [{'filename': f'app/File{i}.kt'} for i in range(50)]
+    budget = 30
+    commit_blocks, file_blocks, elided = compact_changelog(commits, files, render_commit, render_file, budget)
+    assert commit_blocks == ['c1: Fix crash\n']
+    assert 0 < len(file_blocks) < 50
+    assert file_blocks == [render_file(f) for f in files[:len(file_blocks)]]
+    assert total_chars(commit_blocks, file_blocks) <= budget * CHARS_PER_TOKEN
+    assert elided == [f"{50 - len(file_blocks)} of 50 listed files (see CHURN BY MODULE)"]
+
+
+def test_bodies_are_trimmed_then_trailing_commits_dropped():
+    body = 'detail ' * 200
+    commits = [commit(f'c{i}', f'Subject {i}\n\n{body}') for i in range(10)]
+    budget = 150
+    commit_blocks, file_blocks, elided = compact_changelog(commits, [], render_commit, render_file, budget)
+    assert total_chars(commit_blocks, file_blocks) <= budget * CHARS_PER_TOKEN
+    assert commit_blocks[0].startswith('c0: Subject 0')
+    assert any('commit messages' in note for note in elided)
+
+    tight_blocks, _, tight_elided = compact_changelog(commits, [], render_commit, render_file, 10)
+    assert len(tight_blocks) < 10
+    assert tight_elided[-1] == f"the last {10 - len(tight_blocks)} commits"
+
+
+def test_fixed_tokens_reduce_the_room():
+    commits = [commit(f'c{i}', f'Subject {i}') for i in range(20)]
+    roomy, _, _ = compact_changelog(commits, [], render_commit, render_file, 100)
+    squeezed, _, _ = compact_changelog(commits, [], render_commit, render_file, 100, fixed_tokens=80)
+    assert len(squeezed) < len(roomy)
+
+
+def test_truncate_message():
+    assert truncate_message('Subject\n\nlong body text', 0) == 'Subject'
+    assert truncate_message('Subject\n\nlong body text', 4) == 'Subject\n\nlong…'
+    assert truncate_message('Subject\n\nshort', 100) == 'Subject\n\nshort'
+
+
+@pytest.mark.backlog('user-023')
+def test_extra_sections_count_against_the_budget():
+    def events():
+        yield 'summary', {'total_commits': 200}
+        for i in range(200):
+            yield 'commit', {'sha': f'{i:040x}', 'commit': {'message': f'Change {i} ' + 'detail ' * 30,
+                                                             'author': {'name': 'Dev', 'date': '2026-01-01'}}}
+        for i in range(200):
+            yield 'file', {'filename': f'app/src/File{i}.kt', 'additions': i, 'deletions': 1, 'changes': i + 1}
+
+    leading = ['=== PRE-SCORE ===\n'] + ['module line ' * 10 + '\n'] * 40
+    trailing = ['=== PARTNERS ===\n'] + ['partner line ' * 10 + '\n'] * 40
+    budget = 4000
+    plain = ''.join(iter_changelog(events(), 'o', 'r', 'v1', 'v2', changelog_budget=budget))
+    chunks = list(iter_changelog(events(), 'o', 'r', 'v1', 'v2', changelog_budget=budget,
+                                 extra_sections=lambda: (leading, trailing)))
+
+    assert estimate_tokens(plain + ''.join(leading + trailing)) > budget
+    assert estimate_tokens(''.join(chunks)) <= budget
+    assert chunks[:len(leading)] == leading
+    assert chunks[-len(trailing):] == trailing
@@ -0,0 +1,74 @@
+import shutil
+import subprocess
+
+import pytest
+
+from co_change import CoChangeMatrix, find_missing_partners
+from local_git import resolve_ref, tracked_files
+
+
+pytestmark = [
+    pytest.mark.backlog('user-025'),
+    pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed'),
+]
+
+
+def git(repo, *args):
+    subprocess.run(['git', '-C', str(repo), *args], check=True, capture_output=True)
+
+
+def commit(repo, message, **files):
+    for name, text in files.items():
+        (repo / name).write_text(text)
+    git(repo, 'add', '-A')
+    git(repo, 'commit', '-qm', message)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    git(repo, 'init', '-q')
+    git(repo, 'config', 'user.email', 'dev@example.com')
+    git(repo, 'config', 'user.name', 'Dev')
+    for i in range(3):
+        commit(repo, f'change {i}', **{'Foo.kt': f'{i}', 'FooTest.kt': f'{i}', 'Old.kt': f'{i}'})
+    commit(repo, 'solo', **{'Bar.kt': 'bar'})
+    git(repo, 'rm', '-q', 'Old.kt')
+    git(repo, 'commit', '-qm', 'drop Old.kt')
+    return repo
+
+
+def test_pairs_counted_incrementally(repo, tmp_path):
+    matrix = CoChangeMatrix(tmp_path / 'm.bin')
+    assert matrix.update_from_git(repo, 'HEAD') == 5
+    assert matrix.update_from_git(repo, 'HEAD') == 0
+    assert sorted(matrix.partners('Foo.kt')) == [('FooTest.kt', 3, 1.0), ('Old.kt', 3, 1.0)]
+    assert matrix.partners('Bar.kt') == []
+
+    commit(repo, 'again', **{'Foo.kt': 'x', 'FooTest.kt': 'x'})
+    assert matrix.update_from_git(repo, 'HEAD') == 1
+    assert matrix.partners('Foo.kt')[0] == ('FooTest.kt', 4, 1.0)
+
+
+def test_matrix_round_trips_through_disk(repo, tmp_path):
+    matrix = CoChangeMatrix(tmp_path / 'm.bin')
+    matrix.update_from_git(repo, 'HEAD')
+    matrix.save()
+
+    loaded = CoChangeMatrix(tmp_path / 'm.bin')
+    assert loaded.tips == matrix.tips
+    assert loaded.partners('Foo.kt') == matrix.partners('Foo.kt')
+    assert loaded.update_from_git(repo, 'HEAD') == 0
+
+
+def test_deleted_partners_are_not_reported(repo, tmp_path):
+    matrix = CoChangeMatrix(tmp_path / 'm.bin')
+    matrix.update_from_git(repo, 'HEAD')
+    present = tracked_files(repo, resolve_ref(repo, 'HEAD'))
+    assert present == {'Foo.kt', 'FooTest.kt', 'Bar.kt'}
+
+    missing = find_missing_partners(['Foo.kt'], matrix, present)
+    assert [(m['filename'], m['partner']) for m in missing] == [('Foo.kt', 'FooTest.kt')]
+    assert find_missing_partners(['Foo.kt', 'FooTest.kt'], matrix, present) == []
+    assert find_missing_partners(['Foo.kt'], matrix, present, ignore=lambda path: path.endswith('Test.kt')) == []
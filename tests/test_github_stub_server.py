@@ -0,0 +1,163 @@
+"""Paginated compare, ETag revalidation and GraphQL enrichment against a local stub of the GitHub API"""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from github_client import GitHubClient
+from github_graphql import enrich_commits_graphql
+from http_cache import HTTPCache
+from weekly_automation_with_fetch import iter_compare
+
+
+COMPARE_PATH = '/repos/o/r/compare/v1...v2'
+# The stub pages by its own size, whatever per_page the client asks for
+STUB_PAGE_SIZE = 2
+COMMITS = [{'sha': f'{i:040x}', 'commit': {'message': f'Commit {i}',
+                                           'author': {'name': 'Dev', 'date': '2026-01-01T00:00:00Z'}}}
+           for i in range(5)]
+FILES = [{'filename': 'app/Foo.kt', 'status': 'modified', 'additions': 3, 'deletions': 1, 'changes': 4}]
+
+
+class StubGitHub(BaseHTTPRequestHandler):
+    requests_seen = []
+    # GraphQL batches containing one of these SHAs answer 501
+    failing_shas = set()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        page = int(parse_qs(url.query).get('page', ['1'])[0])
+        type(self).requests_seen.append((page, self.headers.get('If-None-Match')))
+        if url.path != COMPARE_PATH:
+            self.send_error(404)
+            return
+
+        etag = f'"compare-page-{page}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        start = (page - 1) * STUB_PAGE_SIZE
+        body = {'total_commits': len(COMMITS), 'commits': COMMITS[start:start + STUB_PAGE_SIZE]}
+        if page == 1:
+            body['files'] = FILES
+            body['merge_base_commit'] = {'sha': 'f' * 40}
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('ETag', etag)
+        if start + STUB_PAGE_SIZE < len(COMMITS):
+            host, port = self.server.server_address[:2]
+            self.send_header('Link', f'<http://{host}:{port}{COMPARE_PATH}?page={page + 1}>; rel="next"')
+        self.end_headers()
+        self.wfile.write(data)
+
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        shas = re.findall(r'object\(oid: "(\w+)"\)', body['query'])
+        type(self).requests_seen.append(('graphql', shas))
+        if self.path != '/graphql':
+            self.send_error(404)
+            return
+        if type(self).failing_shas.intersection(shas):
+            self.send_error(501)
+            return
+
+        nodes = {f'c{i}': {'additions': i + 1, 'deletions': 0, 'changedFilesIfAvailable': 1,
+                           'statusCheckRollup': {'state': 'SUCCESS'},
+                           'associatedPullRequests': {'nodes': []}}
+                 for i in range(len(shas))}
+        data = json.dumps({'data': {'repository': nodes}}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def api_url():
+    StubGitHub.requests_seen = []
+    StubGitHub.failing_shas = set()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubGitHub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(api_url, cache=None):
+    client = GitHubClient('token', api_url=api_url, cache=cache)
+    try:
+        return list(iter_compare(client, 'o', 'r', 'v1', 'v2'))
+    finally:
+        client.close()
+
+
+@pytest.mark.backlog('user-001')
+def test_compare_follows_link_pagination(api_url):
+    events = fetch(api_url)
+
+    assert events[0][0] == 'summary'
+    assert events[0][1]['total_commits'] == 5
+    assert events[0][1]['merge_base_commit'] == {'sha': 'f' * 40}
+    assert [item['sha'] for kind, item in events if kind == 'commit'] == [c['sha'] for c in COMMITS]
+    # Files come from the first page only, after every commit
+    assert [kind for kind, _ in events][-1] == 'file'
+    assert [item['filename'] for kind, item in events if kind == 'file'] == ['app/Foo.kt']
+    assert [page for page, _ in StubGitHub.requests_seen] == [1, 2, 3]
+
+
+@pytest.mark.backlog('user-003')
+def test_etag_revalidation_serves_cached_pages(api_url, tmp_path):
+    cache = HTTPCache(str(tmp_path / 'http'))
+    first = fetch(api_url, cache)
+    assert all(etag is None for _, etag in StubGitHub.requests_seen)
+    assert cache.misses == 3 and cache.revalidated == 0
+
+    StubGitHub.requests_seen = []
+    second = fetch(api_url, cache)
+    assert StubGitHub.requests_seen == [(1, '"compare-page-1"'), (2, '"compare-page-2"'), (3, '"compare-page-3"')]
+    assert cache.revalidated == 3
+    assert second == first
+
+
+def enrich(api_url, shas):
+    client = GitHubClient('token', api_url=api_url)
+    try:
+        return enrich_commits_graphql(client, 'o', 'r', shas, batch_size=2)
+    finally:
+        client.close()
+
+
+@pytest.mark.backlog('user-006')
+def test_graphql_enrichment_batches_commits(api_url):
+    shas = [c['sha'] for c in COMMITS]
+    enriched = enrich(api_url, shas)
+
+    assert StubGitHub.requests_seen == [('graphql', shas[0:2]), ('graphql', shas[2:4]), ('graphql', shas[4:])]
+    assert [e['stats']['additions'] for e in enriched] == [1, 2, 1, 2, 1]
+    assert all(e['checks'] == 'success' for e in enriched)
+
+
+@pytest.mark.backlog('user-006')
+def test_failed_graphql_batch_leaves_its_commits_unenriched(api_url, capsys):
+    shas = [c['sha'] for c in COMMITS]
+    StubGitHub.failing_shas = {shas[2]}
+    enriched = enrich(api_url, shas)
+
+    assert len(StubGitHub.requests_seen) == 3
+    assert enriched[2:4] == [None, None]
+    assert all(enriched[i] for i in (0, 1, 4))
+    assert '1 of 3 GraphQL batches failed' in capsys.readouterr().out
@@ -0,0 +1,94 @@
+import zlib
+
+import pytest
+
+from hotspots import HotspotIndex, P0Mentions
+from release_model import FileChange
+
+
+pytestmark = pytest.mark.backlog('user-024')
+
+
+def module_of(filename):
+    return filename.rsplit('/', 1)[0] if '/' in filename else '(root)'
+
+
+def record(index, release_id, filenames, p0_texts):
+    files = [FileChange(name, additions=10, deletions=2) for name in filenames]
+    return index.record_release(release_id, files, module_of, p0_texts)
+
+
+@pytest.mark.parametrize('text, filename', [
+    ('VOICE-12 Foo crashes on resume', 'app/src/Foo.kt'),
+    ('Api returns 500 for empty payloads', 'net/Api.kt'),
+    ('FooViewModel leaks the recorder', 'app/FooViewModel.kt'),
+    ('Signing config dropped from build.gradle.kts', 'app/build.gradle.kts'),
+    ('Placeholder missing in values/strings.xml', 'app/res/values/strings.xml'),
+])
+def test_class_and_file_names_count_as_hits(text, filename):
+    assert P0Mentions([text]).names_file(filename)
+
+
+@pytest.mark.parametrize('text, filename', [
+    ('VOICE-12 Foo — build changes', 'app/build.gradle.kts'),
+    ('Main screen strings are truncated', 'app/res/values/strings.xml'),
+    ('Main thread blocked on startup', 'app/Main.kt'),
+    ('Voice playback stutters', 'feature/voice/VOICE.kt'),
+    ('foo is null after resume', 'app/Foo.kt'),
+])
+def test_generic_words_and_ticket_keys_are_not_hits(text, filename):
+    assert not P0Mentions([text]).names_file(filename)
+
+
+def test_modules_hit_by_name_or_through_their_files():
+    mentions = P0Mentions(['VOICE-12 Recorder drops audio in the player module'])
+    assert mentions.names_module('feature/player')
+    assert not mentions.names_module('feature/voice')
+    assert not mentions.names_module('app')
+
+
+def test_record_release_counts_hits_and_decays_churn(tmp_path):
+    index = HotspotIndex(tmp_path / 'r.bin')
+    assert record(index, 'v1...v2', ['app/Foo.kt', 'app/build.gradle.kts'], ['VOICE-12 Foo — build changes'])
+    assert not record(index, 'v1...v2', ['app/Foo.kt'], [])
+
+    assert index.files.p0_hits[index.files.index['app/Foo.kt']] == 1
+    assert index.files.p0_hits[index.files.index['app/build.gradle.kts']] == 0
+    assert index.modules.p0_hits[index.modules.index['app']] == 1
+    churn = index.files.churn[index.files.index['app/Foo.kt']]
+    record(index, 'v2...v3', ['lib/Bar.kt'], [])
+    assert index.files.churn[index.files.index['app/Foo.kt']] == pytest.approx(churn * 0.8)
+
+
+def test_index_round_trips_through_disk(tmp_path):
+    index = HotspotIndex(tmp_path / 'r.bin')
+    record(index, 'v1...v2', ['app/Foo.kt', 'lib/Bar.kt'], ['Foo crashes'])
+    index.save()
+
+    loaded = HotspotIndex(tmp_path / 'r.bin')
+    assert loaded.releases == ['v1...v2']
+    assert loaded.files.names == index.files.names
+    assert list(loaded.files.churn) == list(index.files.churn)
+    assert list(loaded.files.p0_hits) == [1, 0]
+    assert loaded.modules.names == ['app', 'lib']
+    assert loaded.describe('app/Foo.kt') == index.describe('app/Foo.kt')
+
+
+@pytest.mark.parametrize('data', [
+    b'RDHS\x02' + b'not zlib',
+    b'RDHS\x02' + zlib.compress(b'\x05\x00\x00\x00{"rel'),
+    b'RDHS\x01\x03\x0b' + zlib.compress(b'old marshal payload'),
+])
+def test_unreadable_index_is_moved_aside_not_overwritten(tmp_path, capsys, data):
+    path = tmp_path / 'r.bin'
+    path.write_bytes(data)
+
+    index = HotspotIndex(path)
+    assert index.releases == [] and index.files.names == []
+    assert (tmp_path / 'r.bin.bak').read_bytes() == data
+    assert 'starting without history' in capsys.readouterr().out
+
+    record(index, 'v1...v2', ['app/Foo.kt'], [])
+    index.save()
+    assert (tmp_path / 'r.bin.bak').read_bytes() == data
+    assert HotspotIndex(path).releases == ['v1...v2']
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from json_stream import iter_json_object
+
+
+pytestmark = pytest.mark.backlog('user-010')
+
+
+PAYLOAD = {
+    'status': 'ahead',
+    'total_commits': 3,
+    'commits': [
+        {'sha': 'a' * 40, 'commit': {'message': 'Fix crash — naïve “quotes” 🎉'}},
+        {'sha': 'b' * 40, 'commit': {'message': 'nested [1, {"x": "]"}]'}},
+        {'sha': 'c' * 40, 'commit': {'message': ''}},
+    ],
+    'merge_base_commit': {'sha': 'd' * 40},
+    'files': [{'filename': 'app/Foo.kt', 'additions': 12345, 'deletions': 0, 'patch': '@@ -1 +1 @@\n-a\n+b'}],
+    'empty': [],
+    'flag': True,
+}
+
+
+def chunked(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def rebuild(events):
+    result = {}
+    for kind, key, value in events:
+        if kind == 'item':
+            result.setdefault(key, []).append(value)
+        else:
+            result[key] = value
+    return result
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64, 1 << 20])
+def test_matches_json_loads_for_any_chunking(chunk_size):
+    # Tiny chunks split multi-byte UTF-8 characters, numbers and literals
+    data = json.dumps(PAYLOAD, ensure_ascii=False, indent=1).encode()
+    assert rebuild(iter_json_object(chunked(data, chunk_size))) == PAYLOAD
+
+
+def test_streams_selected_arrays_item_by_item_in_document_order():
+    data = json.dumps(PAYLOAD).encode()
+    events = [(kind, key) for kind, key, _ in iter_json_object(chunked(data, 5))]
+    assert events == [
+        ('value', 'status'), ('value', 'total_commits'),
+        ('item', 'commits'), ('item', 'commits'), ('item', 'commits'),
+        ('value', 'merge_base_commit'), ('item', 'files'), ('value', 'empty'), ('value', 'flag'),
+    ]
+
+
+def test_empty_object_and_empty_streamed_array():
+    assert list(iter_json_object([b' { } '])) == []
+    assert list(iter_json_object([b'{"commits": [], "n": 1}'])) == [('value', 'n', 1)]
+
+
+@pytest.mark.parametrize('data', [b'[1, 2]', b'{"commits": [1 2]}', b'{"a": 1 "b": 2}', b'{"a": tru'])
+def test_malformed_input_raises(data):
+    with pytest.raises(ValueError):
+        list(iter_json_object(chunked(data, 3)))
@@ -0,0 +1,65 @@
+import shutil
+import subprocess
+
+import pytest
+
+from local_git import local_file_changes, resolve_ref
+
+
+pytestmark = [
+    pytest.mark.backlog('user-007'),
+    pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed'),
+]
+
+
+def git(repo, *args):
+    subprocess.run(['git', '-C', str(repo), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, 'init', '-q')
+    git(tmp_path, 'config', 'user.email', 'dev@example.com')
+    git(tmp_path, 'config', 'user.name', 'Dev')
+    (tmp_path / 'kept.txt').write_text('one\ntwo\n')
+    (tmp_path / 'gone.txt').write_text('bye\n')
+    (tmp_path / 'moved.kt').write_text(''.join(f'line {i}\n' for i in range(20)))
+    (tmp_path / 'logo.png').write_bytes(b'\x89PNG\x00\x01')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-qm', 'base')
+    git(tmp_path, 'branch', 'base')
+
+    (tmp_path / 'kept.txt').write_text('one\n2\nthree\n')
+    git(tmp_path, 'rm', '-q', 'gone.txt')
+    git(tmp_path, 'mv', 'moved.kt', 'renamed dir é.kt')
+    (tmp_path / 'new file.txt').write_text('hello\n')
+    (tmp_path / 'logo.png').write_bytes(b'\x89PNG\x00\x02\x03')
+    git(tmp_path, 'add', '-A')
+    git(tmp_path, 'commit', '-qm', 'head')
+    return tmp_path
+
+
+def test_statuses_churn_and_odd_names(repo):
+    files = local_file_changes(repo, resolve_ref(repo, 'base'), resolve_ref(repo, 'HEAD'))
+    by_name = {f['filename']: f for f in files}
+
+    assert set(by_name) == {'kept.txt', 'gone.txt', 'renamed dir é.kt', 'new file.txt', 'logo.png'}
+    assert by_name['kept.txt'] == {'filename': 'kept.txt', 'additions': 2, 'deletions': 1,
+                                   'status': 'modified', 'changes': 3}
+    assert by_name['gone.txt']['status'] == 'removed'
+    assert by_name['new file.txt']['status'] == 'added'
+    assert by_name['renamed dir é.kt']['status'] == 'renamed'
+    assert by_name['renamed dir é.kt']['previous_filename'] == 'moved.kt'
+    # numstat reports binaries as "-"
+    assert by_name['logo.png']['additions'] == 0 and by_name['logo.png']['changes'] == 0
+
+
+def test_diff_is_against_the_merge_base(repo):
+    head = resolve_ref(repo, 'HEAD')
+    git(repo, 'checkout', '-q', 'base')
+    (repo / 'base_only.txt').write_text('later on base\n')
+    git(repo, 'add', '.')
+    git(repo, 'commit', '-qm', 'base moves on')
+
+    files = local_file_changes(repo, resolve_ref(repo, 'base'), head)
+    assert 'base_only.txt' not in {f['filename'] for f in files}
@@ -0,0 +1,36 @@
+import pytest
+
+from patch_id import fingerprint_files, group_duplicates
+
+
+pytestmark = pytest.mark.backlog('user-015')
+
+
+def test_cherry_picks_fold_into_the_first_occurrence():
+    shas = ['a', 'b', 'c', 'd', 'e']
+    ids = {'a': 'p1', 'b': 'p2', 'c': 'p1', 'd': 'p1', 'e': 'p2'}
+    assert group_duplicates(shas, ids) == {'a': ['c', 'd'], 'b': ['e']}
+
+
+def test_commits_without_a_fingerprint_are_never_merged():
+    # Merges and empty commits have no patch id
+    shas = ['m1', 'a', 'm2', 'b']
+    ids = {'m1': None, 'a': 'p1', 'b': 'p1'}
+    assert group_duplicates(shas, ids) == {'m1': [], 'a': ['b'], 'm2': []}
+
+
+def test_order_of_kept_commits_follows_input():
+    assert list(group_duplicates(['z', 'y', 'x'], {})) == ['z', 'y', 'x']
+
+
+def test_fingerprint_ignores_context_and_whitespace():
+    patch = '@@ -1,3 +1,3 @@\n context\n-old  line\n+new line\n'
+    shifted = '@@ -40,3 +41,3 @@\n other context\n- old line\n+new  line \n'
+    files = [{'filename': 'Foo.kt', 'patch': patch}]
+    assert fingerprint_files(files) == fingerprint_files([{'filename': 'Foo.kt', 'patch': shifted}])
+    assert fingerprint_files(files) != fingerprint_files([{'filename': 'Bar.kt', 'patch': patch}])
+
+
+def test_fingerprint_tolerates_blank_patch_lines():
+    assert fingerprint_files([{'filename': 'Foo.kt', 'patch': '@@ -1 +1 @@\n\n-a\n+b'}]) == \
+        fingerprint_files([{'filename': 'Foo.kt', 'patch': '@@ -1 +1 @@\n-a\n+b'}])
@@ -0,0 +1,53 @@
+import re
+
+import pytest
+
+from path_rules import PathClassifier, glob_to_regex, DEFAULT_CLASS
+
+
+pytestmark = pytest.mark.backlog('user-016')
+
+
+def matches(glob: str, path: str) -> bool:
+    return re.fullmatch(glob_to_regex(glob), path) is not None
+
+
+@pytest.mark.parametrize('glob, path, expected', [
+    ('**/build/**', 'build/out.txt', True),
+    ('**/build/**', 'app/build/generated/R.java', True),
+    ('**/build/**', 'app/rebuild/x.kt', False),
+    ('**/*.lock', 'yarn.lock', True),
+    ('**/*.lock', 'a/b/Podfile.lock', True),
+    ('*.gradle', 'build.gradle', True),
+    ('*.gradle', 'app/build.gradle', False),
+    ('**/values-*/strings.xml', 'app/src/main/res/values-de/strings.xml', True),
+    ('**/values-*/strings.xml', 'app/src/main/res/values/strings.xml', False),
+    ('**/values-*/strings.xml', 'res/values-de/nested/strings.xml', False),
+    ('src/?.kt', 'src/A.kt', True),
+    ('src/?.kt', 'src/AB.kt', False),
+    ('src/?.kt', 'src//.kt', False),
+    ('a+b/(c).kt', 'a+b/(c).kt', True),
+    ('a+b/(c).kt', 'aab/c.kt', False),
+])
+def test_glob_to_regex(glob, path, expected):
+    assert matches(glob, path) is expected
+
+
+def test_classifier_uses_first_matching_class_and_default():
+    classifier = PathClassifier({'generated': ['**/build/**'], 'test': ['**/src/test/**']})
+    assert classifier.classify('app/build/src/test/FooTest.kt') == 'generated'
+    assert classifier.classify('app/src/test/FooTest.kt') == 'test'
+    assert classifier.classify('app/src/main/Foo.kt') == DEFAULT_CLASS
+
+
+def test_default_rules():
+    classifier = PathClassifier()
+    assert classifier.classify('app/src/main/res/values-fr/strings.xml') == 'locale'
+    assert classifier.classify('third_party/lib/x.c') == 'vendored'
+    assert classifier.classify('app/build.gradle.kts') == 'build'
+    assert classifier.classify('app/src/main/java/Foo.kt') == 'source'
+
+
+def test_class_names_must_be_identifiers():
+    with pytest.raises(ValueError):
+        PathClassifier({'not a name': ['**']})
@@ -0,0 +1,46 @@
+import pytest
+
+from release_discovery import build_release_index, resolve_latest_range
+from weekly_automation_with_fetch import update_preliminary_risk
+
+
+pytestmark = pytest.mark.backlog('user-014')
+
+
+def tags(*names):
+    return build_release_index([{'name': name, 'kind': 'tag', 'sha': name} for name in names])
+
+
+def test_release_candidate_compares_against_the_previous_release():
+    assert resolve_latest_range(tags('v4.32.0', 'v4.33.0-rc1')) == ('v4.32.0', 'v4.33.0-rc1', '4.33.0-rc1')
+
+
+def test_final_release_skips_its_own_release_candidates():
+    assert resolve_latest_range(tags('v4.32.0', 'v4.33.0-rc2', 'v4.33.0')) == ('v4.32.0', 'v4.33.0', '4.33.0')
+
+
+def test_hotfix_compares_against_its_previous_version():
+    assert resolve_latest_range(tags('v4.32.0', 'v4.33.0', 'v4.33.1')) == ('v4.33.0', 'v4.33.1', '4.33.1')
+
+
+def test_branches_win_over_tags():
+    index = build_release_index([{'name': 'release/4.32.0', 'kind': 'branch', 'sha': 'a'},
+                                 {'name': 'release/4.33.0', 'kind': 'branch', 'sha': 'b'},
+                                 {'name': 'v4.34.0', 'kind': 'tag', 'sha': 'c'}])
+    assert resolve_latest_range(index)[:2] == ('release/4.32.0', 'release/4.33.0')
+
+
+def test_single_release_has_nothing_to_compare_against():
+    with pytest.raises(ValueError):
+        resolve_latest_range(tags('v4.33.0-rc1', 'v4.33.0'))
+
+
+def test_dashboard_version_line_accepts_prerelease_versions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'index.html').write_text(
+        '<span class="risk-level risk-low">LOW</span>\n'
+        '<p><strong>Android RC 4.33.0-rc1</strong> • Week of Jan 5</p>\n')
+    update_preliminary_risk('HIGH', '4.33.0-rc2', 'Jan 12')
+    content = (tmp_path / 'index.html').read_text()
+    assert '<strong>Android RC 4.33.0-rc2</strong> • Week of Jan 12' in content
+    assert 'rc1' not in content
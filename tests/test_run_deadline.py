@@ -0,0 +1,33 @@
+import pytest
+
+from github_client import DeadlineExceeded
+from release_model import Release
+from weekly_automation_with_fetch import iter_changelog
+
+
+pytestmark = pytest.mark.backlog('user-020')
+
+
+def commit(i):
+    return {'sha': f'{i:040x}', 'commit': {'message': f'Commit {i}', 'author': {'name': 'Dev', 'date': '2026-01-01'}}}
+
+
+def events(cut_short):
+    yield 'summary', {'total_commits': 3}
+    yield 'commit', commit(0)
+    if cut_short:
+        raise DeadlineExceeded("Run deadline reached")
+    yield 'commit', commit(1)
+    yield 'commit', commit(2)
+
+
+@pytest.mark.parametrize('cut_short', [False, True])
+def test_cut_off_fetch_is_reported_to_the_caller(cut_short):
+    release = Release('o', 'r', 'v1', 'v2')
+    deadline_notes = []
+    text = ''.join(iter_changelog(release.record(events(cut_short)), 'o', 'r', 'v1', 'v2',
+                                  deadline_notes=deadline_notes))
+
+    assert bool(deadline_notes) == cut_short
+    assert ('this changelog is partial' in text) == cut_short
+    assert len(release.commits) == (1 if cut_short else 3)
@@ -0,0 +1,107 @@
+"""
+Deterministic ticket extraction and per-ticket grouping
+
+Ticket IDs (VOICE-827, NUX-1844) used to be recovered only from Claude's
+answer. This scans commit messages and PR titles once, before the LLM,
+and groups commits by ticket with their churn, files and authors. Claude
+then gets one line per ticket instead of one block per commit, and the
+ticket list is a trusted reference to check its answer against.
+"""
+
+import re
+
+
+TICKET_PATTERN = re.compile(r'\b([A-Z][A-Z0-9]+-\d+)\b')
+# Upper-case names followed by a number that are standards, encodings or
+# platform levels rather than project keys (UTF-8, SHA-256, API-34)
+NOT_TICKET_PREFIXES = frozenset({
+    'UTF', 'UCS', 'SHA', 'MD', 'ISO', 'IEC', 'RFC', 'CVE', 'CWE', 'API', 'SDK', 'JDK', 'JVM', 'JSR', 'JEP',
+    'AGP', 'HTTP', 'TLS', 'SSL', 'AES', 'RSA', 'HMAC', 'CRC', 'ARM', 'ARM64', 'X86', 'WCAG', 'UTC', 'GMT',
+    'MPEG', 'MP', 'AV', 'VP', 'IEEE', 'ECMA', 'ES', 'PEP',
+})
+
+MAX_LISTED_SHAS = 3
+
+
+def find_tickets(text: str, prefixes=None) -> list:
+    """Distinct ticket IDs in `text`, in order of first mention
+
+    With `prefixes` (project keys such as VOICE, NUX, LSN) only those keys
+    count; otherwise any key outside NOT_TICKET_PREFIXES does.
+    """
+    keys = []
+    for key in dict.fromkeys(TICKET_PATTERN.findall(text)):
+        prefix = key.rsplit('-', 1)[0]
+        if prefix in prefixes if prefixes else prefix not in NOT_TICKET_PREFIXES:
+            keys.append(key)
+    return keys
+
+
+def group_by_ticket(commits: list, enrichments: list, prefixes=None):
+    """({ticket: group}, [indexes of commits without a ticket])
+
+    `commits` are (sha, author, date, message) tuples and `enrichments`
+    the matching enricher results (or None). A commit naming several
+    tickets counts toward each of them. `prefixes` restricts ticket keys
+    as in find_tickets.
+    """
+    groups = {}
+    unticketed = []
+    for index, (commit, enrichment) in enumerate(zip(commits, enrichments)):
+        sha, author, _, message = commit[:4]
+        pulls = (enrichment or {}).get('pulls') or []
+        keys = find_tickets(message + '\n' + '\n'.join(pr['title'] for pr in pulls), prefixes)
+        if not keys:
+            unticketed.append(index)
+            continue
+
+        stats = (enrichment or {}).get('stats') or {}
+        for key in keys:
+            group = groups.setdefault(key, {
+                'title': None, 'shas': [], 'authors': [], 'pulls': [],
+                'additions': 0, 'deletions': 0, 'files': 0, 'has_stats': False,
+            })
+            group['title'] = group['title'] or _title_for(key, message, pulls)
+            group['shas'].append(sha)
+            if author not in group['authors']:
+                group['authors'].append(author)
+            for pr in pulls:
+                if pr['number'] not in group['pulls']:
+                    group['pulls'].append(pr['number'])
+            if stats:
+                group['has_stats'] = True
+                group['additions'] += stats.get('additions', 0)
+                group['deletions'] += stats.get('deletions', 0)
+                group['files'] += enrichment.get('files') or 0
+    return groups, unticketed
+
+
+def _title_for(key: str, message: str, pulls: list) -> str:
+    """A PR title naming the ticket if there is one, else the commit subject"""
+    for pr in pulls:
+        if key in pr['title']:
+            return pr['title']
+    return message.split('\n', 1)[0]
+
+
+def render_ticket_lines(groups: dict) -> list:
+    """One compact changelog line per ticket"""
+    lines = ["=== TICKETS ===\n\n"]
+    for key, group in groups.items():
+        shas = ', '.join(sha[:7] for sha in group['shas'][:MAX_LISTED_SHAS])
+        if len(group['shas']) > MAX_LISTED_SHAS:
+            shas += ', …'
+        line = f"{key}: {group['title']} | {len(group['shas'])} commits ({shas})"
+        if group['has_stats']:
+            line += f" | +{group['additions']} -{group['deletions']} in {group['files']} files"
+        line += f" | by {', '.join(group['authors'])}"
+        if group['pulls']:
+            line += f" | PRs {', '.join(f'#{number}' for number in group['pulls'])}"
+        lines.append(line + "\n")
+    lines.append("\n")
+    return lines
+
+
+def unknown_tickets(response: str, known: set, prefixes=None) -> list:
+    """Tickets Claude mentioned that appear nowhere in the changelog"""
+    return [key for key in find_tickets(response, prefixes) if key not in known]
@@ -13,16 +13,53 @@ Usage:
         --github-token YOUR_GITHUB_TOKEN \
         --claude-token YOUR_CLAUDE_TOKEN \
         --skip-git
+
+    # Or let it find the latest release branch and its predecessor:
+    python3 weekly_automation_with_fetch.py --repo usespeakeasy/speak-android \
+        --github-token YOUR_GITHUB_TOKEN --claude-token YOUR_CLAUDE_TOKEN
 """
 
 import argparse
+import hashlib
+import heapq
 import json
 import re
+import subprocess
+from functools import partial
 from datetime import datetime
 from pathlib import Path
 import requests
 from anthropic import Anthropic
 
+from github_client import GitHubClient, DeadlineExceeded, GITHUB_API_URL, DEFAULT_POOL_SIZE, DEFAULT_READ_TIMEOUT
+from github_graphql import enrich_commits_graphql
+from local_git import iter_local_compare, resolve_ref, tracked_files
+from mirror_manager import MirrorManager, DEFAULT_MIRROR_ROOT, DEFAULT_TRACKED_REFS
+from json_stream import iter_json_object, STREAM_CHUNK_SIZE
+from patch_sampler import (
+    fetch_missing_patches, file_risk_score, rank_files_by_risk, render_patch_section,
+    DEFAULT_PATCH_BUDGET_TOKENS, DEFAULT_PATCH_FILES
+)
+from http_cache import HTTPCache, DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_BYTES
+from commit_store import CommitStore, DEFAULT_COMMIT_STORE
+from changelog_budget import compact_changelog, estimate_tokens, DEFAULT_CHANGELOG_BUDGET_TOKENS
+from changelog_writer import render_prompt
+from tickets import group_by_ticket, render_ticket_lines, unknown_tickets
+from coverage_pairing import untested_changes, render_untested_lines, render_untested_html, DEFAULT_PAIRING_CACHE
+from risk_prescorer import prescore_release, preliminary_risk_level, render_prescore_lines, render_prescore_html
+from release_model import Release, snapshot_path, save_release, load_release, DEFAULT_SNAPSHOT_DIR
+from hotspots import HotspotIndex, p0_item_texts, DEFAULT_HOTSPOT_DIR
+from co_change import (
+    CoChangeMatrix, find_missing_partners, render_missing_partner_lines, render_missing_partner_html,
+    DEFAULT_COCHANGE_DIR,
+)
+from churn_rollup import PathTrie, render_churn_table, render_churn_html, DEFAULT_ROLLUP_DEPTH
+from path_rules import PathClassifier, LOW_SIGNAL_CLASSES, summarize_collapsed
+from patch_id import local_patch_ids, github_patch_ids, group_duplicates, GIT_PATCH_ID_KEY, GITHUB_PATCH_ID_KEY
+from single_flight import SingleFlight
+from release_discovery import discover_latest_range
+from fetch_engine import AsyncFetchEngine, DEFAULT_CONCURRENCY, DEFAULT_REQUEST_DEADLINE
+
 
 CLAUDE_PROMPT_TEMPLATE = """You are acting as a Lead QA Analyst and Release Risk Assessor. Review the RC changelog below and generate a concise QA risk summary based on all commits with the following structure:
 
@@ -69,78 +106,499 @@ def extract_repo_and_versions(compare_url: str):
     return owner, repo, base, head, version
 
 
-def fetch_changelog_from_github(owner: str, repo: str, base: str, head: str, github_token: str) -> str:
-    """Fetch commit comparison data from GitHub API"""
+# GitHub's compare endpoint returns at most 100 commits per page and only
+# lists files on the first page, capped at 300 for the whole comparison
+COMPARE_PAGE_SIZE = 100
+COMPARE_FILE_CAP = 300
+MAX_FILES_IN_CHANGELOG = 50
+# Room for the header lines and notes, which are written after compaction
+HEADER_RESERVE_TOKENS = 200
+
+
+def iter_compare_pages(client: GitHubClient, owner: str, repo: str, base: str, head: str,
+                       per_page: int = COMPARE_PAGE_SIZE):
+    """Yield each page of the compare response, following the Link header to the end"""
+    url = f"/repos/{owner}/{repo}/compare/{base}...{head}"
+    params = {'per_page': per_page, 'page': 1}
+    
+    while url:
+        response = client.get(url, params=params)
+        response.raise_for_status()
+        yield response.json()
+        
+        # The "next" link already carries the page/per_page query
+        url = response.links.get('next', {}).get('url')
+        params = None
+
+
+def iter_compare(client: GitHubClient, owner: str, repo: str, base: str, head: str):
+    """Stream a compare range as ('summary', page), ('commit', commit) and ('file', file) events
+    
+    The summary event comes first and carries the first page (total_commits,
+    files, ...) minus its commits. Commits are yielded page by page so only
+    one page is held in memory at a time; files follow once all commits
+    have been streamed.
+    """
+    files = []
+    for page_number, page in enumerate(iter_compare_pages(client, owner, repo, base, head), start=1):
+        commits = page.pop('commits', [])
+        if page_number == 1:
+            files = page.get('files', [])
+            page['file_cap'] = COMPARE_FILE_CAP
+            yield 'summary', page
+        for commit in commits:
+            yield 'commit', commit
+    
+    for file_info in files:
+        yield 'file', file_info
+
+
+def enrich_commits(engine: AsyncFetchEngine, owner: str, repo: str, shas: list) -> list:
+    """Fetch per-commit stats, associated PRs and check status concurrently
+    
+    Returns one dict per SHA, in the same order as `shas`. Any part that
+    failed or missed its deadline is left as None and the dict is marked
+    'partial', so the commit store retries it next run.
+    """
+    paths = []
+    for sha in shas:
+        paths.append(f"/repos/{owner}/{repo}/commits/{sha}")
+        paths.append(f"/repos/{owner}/{repo}/commits/{sha}/pulls")
+        paths.append(f"/repos/{owner}/{repo}/commits/{sha}/status")
+    
+    print(f"   🔎 Enriching {len(shas)} commits ({len(paths)} requests, concurrency {engine.concurrency})...")
+    results = engine.fetch_all(paths)
+    
+    enriched = []
+    for i in range(len(shas)):
+        detail, pulls, status = results[i * 3:i * 3 + 3]
+        enriched.append({
+            'stats': detail.get('stats') if detail else None,
+            'files': len(detail.get('files', [])) if detail else None,
+            'pulls': [{'number': pr['number'], 'title': pr['title']} for pr in pulls] if pulls is not None else None,
+            'checks': status.get('state') if status else None,
+            'partial': detail is None or pulls is None or status is None,
+        })
+    
+    if engine.failures:
+        print(f"   ⚠️  {len(engine.failures)} enrichment requests failed or timed out")
+    print(f"   ✅ Enriched {sum(not e['partial'] for e in enriched)} of {len(shas)} commits")
+    
+    return enriched
+
+
+def format_file(file_info: dict) -> str:
+    """Render one file entry of the changelog"""
+    block = (f"{file_info['filename']}\n"
+             f"  +{file_info['additions']} -{file_info['deletions']} (total: {file_info['changes']} changes)\n")
+    if file_info.get('hotspot'):
+        block += f"  {file_info['hotspot']}\n"
+    return block
+
+
+def format_commit(sha: str, author: str, date: str, message: str, enrichment: dict = None,
+                  also_applied_as: list = None) -> str:
+    """Render one commit block of the changelog"""
+    block = f"Commit: {sha[:7]}\n"
+    block += f"Author: {author}\n"
+    block += f"Date: {date}\n"
+    block += f"Message: {message}\n"
+    if also_applied_as:
+        block += f"Also applied as: {', '.join(other[:7] for other in also_applied_as)} (cherry-picks)\n"
+    
+    if enrichment:
+        if enrichment['stats']:
+            stats = enrichment['stats']
+            block += f"Stats: +{stats.get('additions', 0)} -{stats.get('deletions', 0)} in {enrichment['files']} files\n"
+        for pr in enrichment['pulls'] or []:
+            block += f"PR: #{pr['number']} {pr['title']}"
+            if pr.get('labels'):
+                block += f" [{', '.join(pr['labels'])}]"
+            if 'reviews' in pr:
+                block += f" ({pr['reviews']} reviews, {pr['approvals']} approvals)"
+            if pr.get('merged_by'):
+                block += f" merged by {pr['merged_by']}"
+            block += "\n"
+        if enrichment['checks']:
+            block += f"Checks: {enrichment['checks']}\n"
+    
+    block += "-" * 50 + "\n\n"
+    return block
+
+
+def iter_compare_streamed(client: GitHubClient, owner: str, repo: str, base: str, head: str,
+                          per_page: int = COMPARE_PAGE_SIZE):
+    """Same events as iter_compare, but each page is parsed incrementally off the wire
+    
+    Commits and files are decoded one at a time from the response stream,
+    so a compare body with large patches never exists as a whole in
+    memory. Streamed responses bypass the on-disk cache.
+    """
+    url = f"/repos/{owner}/{repo}/compare/{base}...{head}"
+    params = {'per_page': per_page, 'page': 1}
+    summary = {'file_cap': COMPARE_FILE_CAP}
+    summary_sent = False
+    
+    while url:
+        response = client.get(url, params=params, stream=True)
+        response.raise_for_status()
+        
+        for kind, key, value in iter_json_object(response.iter_content(STREAM_CHUNK_SIZE)):
+            if kind == 'value':
+                if not summary_sent:
+                    summary[key] = value
+                continue
+            # total_commits, merge_base_commit etc. all precede the commits array
+            if not summary_sent:
+                yield 'summary', summary
+                summary_sent = True
+            yield ('commit' if key == 'commits' else 'file'), value
+        
+        if not summary_sent:
+            yield 'summary', summary
+            summary_sent = True
+        
+        response.close()
+        url = response.links.get('next', {}).get('url')
+        params = None
+
+
+def fetch_changelog_from_github(client: GitHubClient, owner: str, repo: str, base: str, head: str,
+                                enricher=None, engine: AsyncFetchEngine = None,
+                                patch_budget: int = 0, patch_files: int = DEFAULT_PATCH_FILES,
+                                stream_json: bool = False, commit_store: CommitStore = None,
+                                dedupe_cherry_picks: bool = False, path_classifier: PathClassifier = None,
+                                churn_trie: PathTrie = None, changelog_budget: int = 0,
+                                release: Release = None, ticket_groups: dict = None,
+                                ticket_prefixes: list = None, hotspots: HotspotIndex = None,
+                                deadline_notes: list = None, extra_sections=None) -> list:
+    """Fetch commit comparison data from GitHub API as a list of changelog chunks
+    
+    `enricher(owner, repo, shas)` - enrich_commits (REST) or
+    enrich_commits_graphql bound to their client - adds stats, associated
+    PRs and check status to each commit. With a patch budget, the riskiest
+    files' patches are sampled into the changelog; `engine` fetches the
+    ones GitHub left out of the compare payload. `stream_json` parses the
+    compare pages incrementally to cap peak memory on huge ranges.
+    `dedupe_cherry_picks` fingerprints each commit's patch (one detail
+    fetch per commit not yet in the commit store) to collapse cherry-picks.
+    The compare data is also recorded into `release` for snapshotting
+    (without patches when streaming, to keep the memory cap); a note in
+    `deadline_notes` means the run deadline cut it short.
+    `hotspots` ranks the listed and sampled files by past churn and P0 hits.
+    """
     
     print(f"📥 Fetching changelog from GitHub API...")
     print(f"   Comparing: {base} ... {head}")
     
-    url = f"https://api.github.com/repos/{owner}/{repo}/compare/{base}...{head}"
-    headers = {
-        'Authorization': f'token {github_token}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
+    if stream_json:
+        events = iter_compare_streamed(client, owner, repo, base, head)
+    else:
+        events = iter_compare(client, owner, repo, base, head)
+    if release is not None:
+        events = release.record(events, keep_patches=not stream_json)
+    patch_fetcher = partial(fetch_missing_patches, engine, owner, repo) if engine else None
+    fingerprinter = partial(github_patch_ids, engine, owner, repo) if dedupe_cherry_picks and engine else None
+    if fingerprinter is not None and commit_store is not None:
+        fingerprinter = commit_store.cached_analysis(GITHUB_PATCH_ID_KEY, fingerprinter)
+    return list(iter_changelog(events, owner, repo, base, head, enricher,
+                               patch_budget=patch_budget, patch_files=patch_files, patch_fetcher=patch_fetcher,
+                               commit_store=commit_store, fingerprinter=fingerprinter,
+                               path_classifier=path_classifier, churn_trie=churn_trie,
+                               changelog_budget=changelog_budget, ticket_groups=ticket_groups,
+                               ticket_prefixes=ticket_prefixes, hotspots=hotspots, deadline_notes=deadline_notes,
+                               extra_sections=extra_sections))
+
+
+def fetch_changelog_from_local(repo_path: str, owner: str, repo: str, base: str, head: str,
+                               enricher=None, patch_budget: int = 0, patch_files: int = DEFAULT_PATCH_FILES,
+                               commit_store: CommitStore = None, dedupe_cherry_picks: bool = False,
+                               path_classifier: PathClassifier = None, churn_trie: PathTrie = None,
+                               changelog_budget: int = 0, release: Release = None,
+                               ticket_groups: dict = None, ticket_prefixes: list = None,
+                               hotspots: HotspotIndex = None, deadline_notes: list = None,
+                               extra_sections=None) -> list:
+    """Build the same changelog chunks as fetch_changelog_from_github from a local clone or mirror"""
     
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
+    print(f"📥 Building changelog from local repository {repo_path}...")
+    print(f"   Comparing: {base} ... {head}")
     
-    data = response.json()
+    events = iter_local_compare(repo_path, base, head, include_patches=patch_budget > 0)
+    if release is not None:
+        events = release.record(events)
+    fingerprinter = partial(local_patch_ids, repo_path) if dedupe_cherry_picks else None
+    if fingerprinter is not None and commit_store is not None:
+        fingerprinter = commit_store.cached_analysis(GIT_PATCH_ID_KEY, fingerprinter)
+    return list(iter_changelog(events, owner, repo, base, head, enricher,
+                               patch_budget=patch_budget, patch_files=patch_files, commit_store=commit_store,
+                               fingerprinter=fingerprinter, path_classifier=path_classifier, churn_trie=churn_trie,
+                               changelog_budget=changelog_budget, ticket_groups=ticket_groups,
+                               ticket_prefixes=ticket_prefixes, hotspots=hotspots, deadline_notes=deadline_notes,
+                               extra_sections=extra_sections))
+
+
+def fetch_changelog_from_snapshot(release: Release, enricher=None, patch_budget: int = 0,
+                                  patch_files: int = DEFAULT_PATCH_FILES, commit_store: CommitStore = None,
+                                  path_classifier: PathClassifier = None, churn_trie: PathTrie = None,
+                                  changelog_budget: int = 0, ticket_groups: dict = None,
+                                  ticket_prefixes: list = None, hotspots: HotspotIndex = None,
+                                  extra_sections=None) -> list:
+    """Re-render the changelog chunks of a saved release snapshot without refetching"""
     
-    # Format the changelog
-    changelog = f"Repository: {owner}/{repo}\n"
-    changelog += f"Comparing: {base} → {head}\n"
-    changelog += f"Total commits: {data.get('total_commits', 0)}\n"
-    changelog += f"Files changed: {len(data.get('files', []))}\n\n"
+    print(f"📥 Rendering changelog from saved snapshot...")
+    print(f"   Comparing: {release.base} ... {release.head}")
     
-    changelog += "=== COMMITS ===\n\n"
+    return list(iter_changelog(release.iter_events(), release.owner, release.repo, release.base, release.head,
+                               enricher, patch_budget=patch_budget, patch_files=patch_files,
+                               commit_store=commit_store, path_classifier=path_classifier,
+                               churn_trie=churn_trie, changelog_budget=changelog_budget, ticket_groups=ticket_groups,
+                               ticket_prefixes=ticket_prefixes, hotspots=hotspots, extra_sections=extra_sections))
+
+
+def until_deadline(events, notes: list):
+    """Pass compare events through, stopping early (and noting it) if a deadline cuts the fetch short"""
+    try:
+        yield from events
+    except DeadlineExceeded as e:
+        print(f"   ⏱️  {e}; continuing with the data fetched so far")
+        notes.append(f"NOTE: Fetching stopped early ({e}); this changelog is partial\n\n")
+
+
+def iter_changelog(events, owner: str, repo: str, base: str, head: str, enricher=None,
+                   patch_budget: int = 0, patch_files: int = DEFAULT_PATCH_FILES, patch_fetcher=None,
+                   commit_store: CommitStore = None, fingerprinter=None,
+                   path_classifier: PathClassifier = None, churn_trie: PathTrie = None,
+                   changelog_budget: int = 0, ticket_groups: dict = None, ticket_prefixes: list = None,
+                   hotspots: HotspotIndex = None, deadline_notes: list = None, extra_sections=None):
+    """Render a stream of ('summary'|'commit'|'file', item) compare events as changelog text chunks
     
-    for commit in data.get('commits', []):
-        commit_msg = commit['commit']['message']
-        author = commit['commit']['author']['name']
-        date = commit['commit']['author']['date']
-        sha = commit['sha'][:7]
-        
-        changelog += f"Commit: {sha}\n"
-        changelog += f"Author: {author}\n"
-        changelog += f"Date: {date}\n"
-        changelog += f"Message: {commit_msg}\n"
-        changelog += "-" * 50 + "\n\n"
+    `patch_fetcher(base_sha, head_sha, files)` fills in missing patches
+    for the top-ranked files before they are sampled. Commit metadata is
+    recorded in `commit_store` for later ranges and analyses.
+    `fingerprinter(shas)` returns {sha: patch id}; commits sharing an id
+    are cherry-picks of one change and render as a single entry.
+    Files that `path_classifier` puts in a low-signal class (generated,
+    vendored, locale) are summarized per class instead of listed. Every
+    file's churn goes into `churn_trie` for the per-module table; pass one
+    in to reuse the rollup after the changelog is built. A
+    `changelog_budget` in tokens replaces the fixed 50-file cut with
+    staged compaction of the commit and file listings. When a
+    `ticket_groups` dict is passed, commits naming a ticket are grouped
+    into it and rendered as one line per ticket; `ticket_prefixes` limits
+    tickets to those project keys. With a `hotspots` index,
+    files are listed and sampled in order of current risk boosted by their
+    history, with a note on each file that has one, instead of GitHub's order.
+    If the run deadline stops the event stream, a note goes into the header
+    and into `deadline_notes`; pass a list in to tell a partial fetch apart.
+    `extra_sections()` is called once the stream is consumed (so
+    `churn_trie` and a recording Release are complete) and returns
+    (leading, trailing) line lists that open and close the changelog and
+    count against `changelog_budget`.
+    """
     
-    changelog += "\n=== FILES CHANGED ===\n\n"
+    # Only the riskiest files (and their patches) are kept for sampling,
+    # as a bounded min-heap of (score, arrival order, file)
+    riskiest_heap = []
+    merge_base_sha = None
+    commits = []
+    listed_files = []
+    total_commits = 0
+    commits_seen = 0
+    files_seen = 0
+    files_listed = 0
+    collapsed_files = {}
+    churn_trie = churn_trie if churn_trie is not None else PathTrie()
+    if hotspots:
+        def risk_score(file_info):
+            return file_risk_score(file_info) * hotspots.boost(file_info['filename'])
+    else:
+        risk_score = file_risk_score
+    file_cap = None
+    deadline_notes = deadline_notes if deadline_notes is not None else []
     
-    # Limit to top 50 files to avoid token limits
-    files = data.get('files', [])[:50]
-    for file_info in files:
-        filename = file_info['filename']
-        additions = file_info.get('additions', 0)
-        deletions = file_info.get('deletions', 0)
-        changes = file_info.get('changes', 0)
+    for kind, item in until_deadline(events, deadline_notes):
+        if kind == 'summary':
+            total_commits = item.get('total_commits', 0)
+            file_cap = item.get('file_cap')
+            merge_base_sha = (item.get('merge_base_commit') or {}).get('sha')
         
-        changelog += f"{filename}\n"
-        changelog += f"  +{additions} -{deletions} (total: {changes} changes)\n"
+        elif kind == 'commit':
+            commits_seen += 1
+            commits.append((
+                item['sha'],
+                item['commit']['author']['name'],
+                item['commit']['author']['date'],
+                item['commit']['message'],
+            ))
+        
+        elif kind == 'file':
+            files_seen += 1
+            churn_trie.insert(item['filename'], item.get('additions', 0), item.get('deletions', 0))
+            file_class = path_classifier.classify(item['filename']) if path_classifier else None
+            if file_class in LOW_SIGNAL_CLASSES:
+                totals = collapsed_files.setdefault(
+                    file_class, {'files': 0, 'additions': 0, 'deletions': 0, 'examples': []})
+                totals['files'] += 1
+                totals['additions'] += item.get('additions', 0)
+                totals['deletions'] += item.get('deletions', 0)
+                if len(totals['examples']) < 3:
+                    totals['examples'].append(item['filename'])
+                continue
+            if patch_budget:
+                entry = (risk_score(item), files_seen, item)
+                if len(riskiest_heap) < patch_files:
+                    heapq.heappush(riskiest_heap, entry)
+                elif entry[0] > riskiest_heap[0][0]:
+                    heapq.heapreplace(riskiest_heap, entry)
+            # Without a token budget, limit to the first 50 files to avoid token limits
+            # (the 50 riskiest once ranked by hotspot history, so all are kept until then)
+            files_listed += 1
+            if not changelog_budget and not hotspots and files_listed > MAX_FILES_IN_CHANGELOG:
+                continue
+            file_info = {key: item.get(key, 0) for key in ('filename', 'additions', 'deletions', 'changes')}
+            if hotspots:
+                file_info['rank'] = risk_score(item)
+                file_info['hotspot'] = hotspots.describe(item['filename'])
+            listed_files.append(file_info)
+    
+    if commit_store is not None and commits:
+        commit_store.put_commits(commits)
+    
+    if hotspots and listed_files:
+        listed_files.sort(key=lambda f: f['rank'], reverse=True)
+        if not changelog_budget:
+            del listed_files[MAX_FILES_IN_CHANGELOG:]
+    
+    head_sha = commits[-1][0] if commits else None
+    duplicates = {}
+    collapsed = 0
+    if fingerprinter is not None and commits:
+        shas = [commit[0] for commit in commits]
+        try:
+            duplicates = group_duplicates(shas, fingerprinter(shas))
+        except DeadlineExceeded as e:
+            print(f"   ⏱️  Skipping cherry-pick detection: {e}")
+        collapsed = len(commits) - len(duplicates) if duplicates else 0
+        if collapsed:
+            commits = [commit for commit in commits if commit[0] in duplicates]
+            print(f"   🍒 Collapsed {collapsed} cherry-picked duplicate commits")
+    
+    enrichments = [None] * len(commits)
+    unenriched = 0
+    if enricher is not None and commits:
+        try:
+            enrichments = enricher(owner, repo, [commit[0] for commit in commits])
+        except DeadlineExceeded as e:
+            print(f"   ⏱️  Skipping commit enrichment: {e}")
+        unenriched = sum(1 for e in enrichments if not e or e.get('partial'))
     
-    if len(data.get('files', [])) > 50:
-        changelog += f"\n... and {len(data.get('files', [])) - 50} more files\n"
+    ticket_lines = []
+    entries = [commit + (enrichment,) for commit, enrichment in zip(commits, enrichments)]
+    if ticket_groups is not None and commits:
+        groups, unticketed = group_by_ticket(commits, enrichments, ticket_prefixes)
+        ticket_groups.update(groups)
+        if groups:
+            ticket_lines = render_ticket_lines(groups)
+            entries = [entries[index] for index in unticketed]
+            print(f"   🎫 Grouped {len(commits) - len(unticketed)} commits into {len(groups)} tickets")
     
-    print(f"   ✅ Fetched {data.get('total_commits', 0)} commits")
-    print(f"   ✅ Fetched {len(data.get('files', []))} file changes")
+    # Fixed sections first, so the commit and file listings get what's left of the budget
+    leading_lines, trailing_lines = extra_sections() if extra_sections is not None else ([], [])
+    tail_lines = []
+    if collapsed_files:
+        tail_lines.extend(summarize_collapsed(collapsed_files))
+    if patch_budget and riskiest_heap:
+        riskiest = rank_files_by_risk([entry[2] for entry in riskiest_heap], risk_score)
+        if patch_fetcher is not None and merge_base_sha and commits:
+            patch_fetcher(merge_base_sha, head_sha, riskiest)
+        tail_lines.append(render_patch_section(riskiest, patch_budget, risk_score))
+    churn_table = render_churn_table(churn_trie.rollup())
     
-    return changelog
+    def render_commit(commit, message):
+        return format_commit(*commit[:3], message, enrichment=commit[4], also_applied_as=duplicates.get(commit[0]))
+    
+    elided = []
+    if changelog_budget:
+        fixed_sections = leading_lines + ticket_lines + tail_lines + trailing_lines
+        fixed_tokens = estimate_tokens(churn_table + ''.join(fixed_sections)) + HEADER_RESERVE_TOKENS
+        commit_blocks, file_blocks, elided = compact_changelog(entries, listed_files, render_commit, format_file,
+                                                               changelog_budget, fixed_tokens, path_classifier)
+    else:
+        commit_blocks = [render_commit(entry, entry[3]) for entry in entries]
+        file_blocks = [format_file(f) for f in listed_files]
+        if files_listed > MAX_FILES_IN_CHANGELOG:
+            file_blocks.append(f"\n... and {files_listed - MAX_FILES_IN_CHANGELOG} more files\n")
+    
+    commit_lines = ticket_lines + ["=== COMMITS ===\n\n"] + commit_blocks
+    file_lines = ["\n=== FILES CHANGED ===\n\n"] + file_blocks + tail_lines
+    
+    header = [
+        f"Repository: {owner}/{repo}\n",
+        f"Comparing: {base} → {head}\n",
+        f"Total commits: {total_commits}\n",
+        f"Files changed: {files_seen}\n\n",
+    ] + deadline_notes
+    
+    # Tell both the operator and Claude when GitHub has capped the data
+    if commits_seen < total_commits:
+        print(f"   ⚠️  GitHub returned {commits_seen} of {total_commits} commits")
+        header.append(f"NOTE: Only {commits_seen} of {total_commits} commits were returned by GitHub\n\n")
+    if unenriched:
+        header.append(f"NOTE: Stats, PR links or check status are missing or incomplete for {unenriched} of "
+                      f"{len(commits)} commits (requests failed or the run deadline cut enrichment short)\n\n")
+    if ticket_lines:
+        header.append(f"NOTE: Commits that name a ticket are summarized under TICKETS; "
+                      f"COMMITS lists only the {len(entries)} without one\n\n")
+    if collapsed:
+        header.append(f"NOTE: {collapsed} cherry-picked commits are folded into their originals (see 'Also applied as')\n\n")
+    if file_cap and files_seen >= file_cap:
+        print(f"   ⚠️  File list capped by GitHub at {file_cap} files")
+        header.append(f"NOTE: GitHub caps the file list at {file_cap} files; more files may have changed\n\n")
+    if elided:
+        print(f"   ✂️  Compacted to ~{changelog_budget} tokens, eliding: {'; '.join(elided)}")
+        header.append(f"NOTE: To fit a {changelog_budget}-token budget this changelog omits "
+                      f"{'; '.join(elided)}\n\n")
+    
+    print(f"   ✅ Fetched {commits_seen} commits")
+    print(f"   ✅ Fetched {files_seen} file changes")
+    
+    yield from leading_lines
+    yield from header
+    yield from commit_lines
+    yield churn_table
+    yield from file_lines
+    yield from trailing_lines
 
 
-def get_claude_analysis(changelog_data: str, claude_token: str) -> str:
-    """Send changelog data to Claude and get the risk assessment report"""
-    
-    client = Anthropic(api_key=claude_token)
+CLAUDE_MODEL = "claude-sonnet-4-20250514"
+
+# Concurrent sections asking for the same analysis share one Claude call
+claude_flights = SingleFlight()
+
+
+def get_claude_analysis(changelog_data, claude_token: str) -> str:
+    """Send changelog data (text or a list of chunks) to Claude and get the risk assessment report"""
     
-    # Insert changelog data into prompt
-    prompt = CLAUDE_PROMPT_TEMPLATE.format(changelog_data=changelog_data)
+    # Write changelog chunks straight into the prompt
+    prompt = render_prompt(CLAUDE_PROMPT_TEMPLATE, changelog_data)
     
     print("🤖 Sending changelog to Claude for analysis...")
     print(f"   Prompt length: {len(prompt)} characters")
     
+    key = hashlib.sha256(f"{CLAUDE_MODEL}\n{prompt}".encode()).hexdigest()
+    response_text = claude_flights.do(key, request_claude_analysis, prompt, claude_token)
+    print(f"   ✅ Received response ({len(response_text)} characters)")
+    
+    return response_text
+
+
+def request_claude_analysis(prompt: str, claude_token: str) -> str:
+    """The actual Claude API call behind get_claude_analysis"""
+    
+    client = Anthropic(api_key=claude_token)
+    
     message = client.messages.create(
-        model="claude-sonnet-4-20250514",
+        model=CLAUDE_MODEL,
         max_tokens=4000,
         messages=[{
             "role": "user",
@@ -148,10 +606,7 @@ def get_claude_analysis(changelog_data: str, claude_token: str) -> str:
         }]
     )
     
-    response_text = message.content[0].text
-    print(f"   ✅ Received response ({len(response_text)} characters)")
-    
-    return response_text
+    return message.content[0].text
 
 
 def parse_claude_response(response: str) -> dict:
@@ -231,6 +686,37 @@ def parse_claude_response(response: str) -> dict:
     return data
 
 
+def update_preliminary_risk(risk_level: str, version: str, week_of: str):
+    """Show the heuristic risk level on index.html while Claude's analysis is pending
+    
+    Returns the previous index.html content, to restore if the run fails
+    before the final dashboard update, or None if there is no dashboard.
+    """
+    
+    index_path = Path('index.html')
+    if not index_path.exists():
+        return None
+    
+    previous = content = index_path.read_text()
+    risk_class = f'risk-{risk_level.lower().replace("-", "")}'
+    content = re.sub(
+        r'<span class="risk-level risk-\w+">[^<]+</span>',
+        f'<span class="risk-level {risk_class}" title="Heuristic pre-score; Claude analysis pending">'
+        f'{risk_level} (PRELIMINARY)</span>',
+        content,
+        count=1
+    )
+    content = re.sub(
+        r'<strong>Android RC [\w.-]+</strong> • Week of [^<]+',
+        f'<strong>Android RC {version}</strong> • Week of {week_of}',
+        content,
+        count=1
+    )
+    index_path.write_text(content)
+    print(f"   ✅ Dashboard shows preliminary level {risk_level}")
+    return previous
+
+
 def update_main_dashboard(data: dict, version: str, week_of: str, report_date: str):
     """Update the Weekly RC Release Risk section on index.html"""
     
@@ -244,13 +730,13 @@ def update_main_dashboard(data: dict, version: str, week_of: str, report_date: s
     
     # Update risk level badge
     risk_class = f'risk-{data["riskLevel"].lower().replace("-", "")}'
-    old_pattern = r'<span class="risk-level risk-\w+">[^<]+</span>'
+    old_pattern = r'<span class="risk-level risk-\w+"[^>]*>[^<]+</span>'
     new_text = f'<span class="risk-level {risk_class}">{data["riskLevel"]}</span>'
     content = re.sub(old_pattern, new_text, content, count=1)
     
     # Update release version and date
     content = re.sub(
-        r'<strong>Android RC [\d.]+</strong> • Week of [^<]+',
+        r'<strong>Android RC [\w.-]+</strong> • Week of [^<]+',
         f'<strong>Android RC {version}</strong> • Week of {week_of}',
         content,
         count=1
@@ -322,8 +808,26 @@ def update_main_dashboard(data: dict, version: str, week_of: str, report_date: s
     print("   ✅ Main dashboard updated")
 
 
-def create_report_page(claude_response: str, data: dict, version: str, week_of: str, report_date: str):
-    """Create a new detailed report page from template"""
+def render_report_section(emoji: str, title: str, body_html: str) -> str:
+    """One generated section of the report page, styled like the template's own"""
+    return f'''
+        <div class="section">
+            <div class="section-title">
+                <span class="emoji">{emoji}</span>
+                {title}
+            </div>
+            {body_html}
+        </div>
+'''
+
+
+def create_report_page(claude_response: str, data: dict, version: str, week_of: str, report_date: str,
+                       extra_sections: list = None):
+    """Create a new detailed report page from template
+    
+    `extra_sections` are (emoji, title, html) computed from the changelog
+    itself rather than Claude's answer; they go just above the footer.
+    """
     
     print(f"\n📝 Creating new report page (reports/{report_date}.html)...")
     
@@ -421,6 +925,16 @@ def create_report_page(claude_response: str, data: dict, version: str, week_of:
             count=1
         )
     
+    # Insert data sections before the footer
+    if extra_sections:
+        sections_html = ''.join(render_report_section(*section) for section in extra_sections)
+        content = re.sub(
+            r'(\n\s*<!-- =+\s*FOOTER)',
+            lambda match: '\n' + sections_html.rstrip() + match.group(1),
+            content,
+            count=1
+        )
+    
     # Update footer timestamp
     timestamp = datetime.now().strftime("%B %d, %Y at %I:%M %p PST")
     content = re.sub(
@@ -429,7 +943,7 @@ def create_report_page(claude_response: str, data: dict, version: str, week_of:
         content
     )
     content = re.sub(
-        r'Report ID: Android RC [\d.]+',
+        r'Report ID: Android RC [\w.-]+',
         f'Report ID: Android RC {version}',
         content
     )
@@ -448,14 +962,99 @@ def save_full_report(claude_response: str, report_date: str):
 
 def main():
     parser = argparse.ArgumentParser(description='Weekly dashboard with GitHub data fetching')
-    parser.add_argument('--compare-url', required=True, help='GitHub compare URL')
-    parser.add_argument('--github-token', required=True, help='GitHub personal access token')
+    range_group = parser.add_mutually_exclusive_group(required=True)
+    range_group.add_argument('--compare-url', help='GitHub compare URL')
+    range_group.add_argument('--repo', help='owner/name: compare the latest release branch against its predecessor')
+    parser.add_argument('--github-token', help='GitHub personal access token (required unless --source is local)')
+    parser.add_argument('--source', default='github',
+                        help="Changelog source: 'github' (compare API), 'local:/path/to/mirror' (local git clone) "
+                             "'mirror' (managed bare mirror, fetched incrementally each run) "
+                             "or 'snapshot' (re-render the range's saved release snapshot without refetching)")
+    parser.add_argument('--mirror-root', default=DEFAULT_MIRROR_ROOT,
+                        help=f'Directory holding managed bare mirrors (default {DEFAULT_MIRROR_ROOT})')
+    parser.add_argument('--mirror-refs', nargs='+', default=DEFAULT_TRACKED_REFS,
+                        help=f"Branches to keep in the mirror (default: {' '.join(DEFAULT_TRACKED_REFS)})")
+    parser.add_argument('--patch-budget-tokens', type=int, default=DEFAULT_PATCH_BUDGET_TOKENS,
+                        help=f'Token budget for sampled patch hunks of the riskiest files, 0 to disable '
+                             f'(default {DEFAULT_PATCH_BUDGET_TOKENS})')
+    parser.add_argument('--changelog-budget-tokens', type=int, default=DEFAULT_CHANGELOG_BUDGET_TOKENS,
+                        help=f'Token budget the changelog is compacted to, 0 for the fixed 50-file cut '
+                             f'(default {DEFAULT_CHANGELOG_BUDGET_TOKENS})')
+    parser.add_argument('--patch-files', type=int, default=DEFAULT_PATCH_FILES,
+                        help=f'How many of the riskiest files to sample patches from (default {DEFAULT_PATCH_FILES})')
     parser.add_argument('--claude-token', required=True, help='Claude API key')
     parser.add_argument('--skip-git', action='store_true', help='Skip git commit/push')
     parser.add_argument('--date', help='Report date (YYYY-MM-DD), defaults to today')
+    parser.add_argument('--github-pool-size', type=int, default=DEFAULT_POOL_SIZE,
+                        help=f'Max pooled keep-alive connections to GitHub (default {DEFAULT_POOL_SIZE})')
+    parser.add_argument('--github-timeout', type=float, default=DEFAULT_READ_TIMEOUT,
+                        help=f'GitHub read timeout in seconds (default {DEFAULT_READ_TIMEOUT})')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'On-disk GitHub response cache (default {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024),
+                        help='Cache size cap in MB; least-recently-used entries are evicted')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the GitHub response cache')
+    parser.add_argument('--commit-store', default=DEFAULT_COMMIT_STORE,
+                        help=f'SQLite store of per-commit data shared across ranges (default {DEFAULT_COMMIT_STORE})')
+    parser.add_argument('--no-commit-store', action='store_true', help='Disable the commit store')
+    parser.add_argument('--snapshot-dir', default=DEFAULT_SNAPSHOT_DIR,
+                        help=f'Where fetched releases are saved as binary snapshots (default {DEFAULT_SNAPSHOT_DIR})')
+    parser.add_argument('--no-snapshot', action='store_true', help='Do not save a release snapshot')
+    parser.add_argument('--enrich-commits', action='store_true',
+                        help='Fetch per-commit stats, associated PRs and check status')
+    parser.add_argument('--backend', choices=['rest', 'graphql'], default='rest',
+                        help='Enrichment backend: one REST call per commit detail, or batched GraphQL '
+                             '(graphql always enriches, adding PR labels, reviews and merge info)')
+    parser.add_argument('--dedupe-cherry-picks', action='store_true',
+                        help='Collapse commits with identical patches (cherry-picks across branches) into one entry')
+    parser.add_argument('--path-rules',
+                        help='JSON file of {class: [globs]} path rules (default: built-in generated/vendored/'
+                             'locale/build/test rules)')
+    parser.add_argument('--list-all-files', action='store_true',
+                        help='List generated, vendored and locale files individually instead of collapsing them')
+    parser.add_argument('--list-commits', action='store_true',
+                        help='List every commit instead of one line per ticket for commits that name one')
+    parser.add_argument('--ticket-prefixes', nargs='+', metavar='KEY',
+                        help='Project keys that ticket IDs use, e.g. VOICE NUX LSN (default: any upper-case key '
+                             'except common acronyms such as UTF-8 or API-34)')
+    parser.add_argument('--test-pairing-cache', default=DEFAULT_PAIRING_CACHE,
+                        help=f'Cache of source/test pairing indexes, one per tree SHA (default {DEFAULT_PAIRING_CACHE})')
+    parser.add_argument('--no-test-pairing', action='store_true',
+                        help='Skip flagging source changes that have no matching test changes')
+    parser.add_argument('--cochange-dir', default=DEFAULT_COCHANGE_DIR,
+                        help=f'Per-repository co-change matrices built from local history (default {DEFAULT_COCHANGE_DIR})')
+    parser.add_argument('--no-cochange', action='store_true',
+                        help='Skip flagging usual partner files that did not change (local and mirror sources only)')
+    parser.add_argument('--hotspot-dir', default=DEFAULT_HOTSPOT_DIR,
+                        help=f'Per-repository hotspot indexes of past churn and P0 hits (default {DEFAULT_HOTSPOT_DIR})')
+    parser.add_argument('--no-hotspots', action='store_true',
+                        help="Neither rank files by nor record into the hotspot index")
+    parser.add_argument('--rollup-depth', type=int, default=DEFAULT_ROLLUP_DEPTH,
+                        help=f'Directory depth for the churn-by-module table outside Gradle modules '
+                             f'(default {DEFAULT_ROLLUP_DEPTH})')
+    parser.add_argument('--hedge', action='store_true',
+                        help='Send a duplicate GET when a request runs past the observed p95 latency')
+    parser.add_argument('--run-deadline', type=float,
+                        help='Stop fetching after this many seconds and analyze whatever data arrived')
+    parser.add_argument('--stream-json', action='store_true',
+                        help='Parse compare responses incrementally to cap memory on very large ranges (skips the cache)')
+    parser.add_argument('--github-api-url', default=GITHUB_API_URL,
+                        help='GitHub API base URL (GitHub Enterprise or a local stub server)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Max concurrent GitHub enrichment requests (default {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--request-deadline', type=float, default=DEFAULT_REQUEST_DEADLINE,
+                        help=f'Per-request deadline in seconds for GitHub calls (default {DEFAULT_REQUEST_DEADLINE:.0f})')
     
     args = parser.parse_args()
     
+    local_path = args.source[len('local:'):] if args.source.startswith('local:') else None
+    if local_path is None and args.source not in ('github', 'mirror', 'snapshot'):
+        parser.error("--source must be 'github', 'mirror', 'snapshot' or 'local:/path/to/mirror'")
+    if not args.github_token and (args.source == 'github' or args.enrich_commits or args.backend == 'graphql'):
+        parser.error('--github-token is required for the GitHub source and for commit enrichment')
+    if args.repo and not re.fullmatch(r'[\w.-]+/[\w.-]+', args.repo):
+        parser.error('--repo must look like owner/name')
+    
     report_date = args.date or datetime.now().strftime('%Y-%m-%d')
     week_of = datetime.now().strftime('%B %d, %Y')
     
@@ -463,16 +1062,150 @@ def main():
     print("🚀 WEEKLY DASHBOARD AUTOMATION")
     print("=" * 60)
     
+    cache = None if args.no_cache else HTTPCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
+    # Keep enough pooled connections for every concurrent enrichment worker
+    github = GitHubClient(args.github_token, pool_size=max(args.github_pool_size, args.concurrency),
+                          read_timeout=args.github_timeout, cache=cache, api_url=args.github_api_url,
+                          request_deadline=args.request_deadline, hedge=args.hedge, run_deadline=args.run_deadline)
+    
+    engine = AsyncFetchEngine(github, args.concurrency, args.request_deadline)
+    enricher = None
+    if args.backend == 'graphql':
+        enricher = partial(enrich_commits_graphql, github)
+    elif args.enrich_commits:
+        enricher = partial(enrich_commits, engine)
+    
+    commit_store = None if args.no_commit_store else CommitStore(args.commit_store)
+    path_classifier = None
+    if not args.list_all_files:
+        path_classifier = PathClassifier.from_file(args.path_rules) if args.path_rules else PathClassifier()
+    churn_trie = PathTrie(args.rollup_depth)
+    ticket_groups = None if args.list_commits else {}
+    if commit_store is not None and enricher is not None:
+        enricher = commit_store.cached_enricher(enricher)
+    
+    previous_dashboard = None
     try:
-        # Extract repo info from URL
-        print(f"\n📊 STEP 1: Parsing compare URL...")
-        owner, repo, base, head, version = extract_repo_and_versions(args.compare_url)
+        # Extract repo info from URL, or discover the latest release range
+        if args.compare_url:
+            print(f"\n📊 STEP 1: Parsing compare URL...")
+            owner, repo, base, head, version = extract_repo_and_versions(args.compare_url)
+        else:
+            print(f"\n📊 STEP 1: Discovering latest release range...")
+            owner, repo = args.repo.split('/')
         print(f"   Repo: {owner}/{repo}")
+        
+        if args.source == 'mirror':
+            print(f"\n🪞 Syncing local mirror...")
+            mirrors = MirrorManager(args.mirror_root, args.github_token, args.mirror_refs)
+            local_path = str(mirrors.sync(owner, repo))
+        
+        if not args.compare_url:
+            base, head, version = discover_latest_range(owner, repo, client=github, repo_path=local_path)
+            print(f"   Range: {base} ... {head}")
         print(f"   Version: {version}")
         
-        # Fetch changelog data from GitHub
-        print(f"\n📥 STEP 2: Fetching changelog from GitHub API...")
-        changelog_data = fetch_changelog_from_github(owner, repo, base, head, args.github_token)
+        # Fetch changelog data from GitHub or the local mirror, or replay a snapshot
+        snapshot = snapshot_path(args.snapshot_dir, owner, repo, base, head)
+        hotspots = None if args.no_hotspots else HotspotIndex.for_repo(args.hotspot_dir, owner, repo)
+        release = Release(owner, repo, base, head)
+        deadline_notes = []
+        ranked = preliminary_level = untested = missing_partners = None
+
+        def release_sections():
+            """Pre-score, test pairing and partner sections, built once the fetch has filled `release`"""
+            nonlocal ranked, preliminary_level, untested, missing_partners, previous_dashboard
+            # Rank modules locally and show a preliminary level before Claude answers
+            print("\n🧮 Pre-scoring changes...")
+            ranked = prescore_release(release, churn_trie, path_classifier)
+            preliminary_level = preliminary_risk_level(ranked)
+            for row in ranked[:3]:
+                print(f"   {row['score']:6.1f}  {row['module']}: {', '.join(row['reasons'])}")
+            print(f"   Preliminary risk level: {preliminary_level}")
+            previous_dashboard = update_preliminary_risk(preliminary_level, version, week_of)
+            leading = render_prescore_lines(ranked, preliminary_level)
+            trailing = []
+            
+            # Pair changed source files with their tests over the full file list
+            # (a snapshot replay stays offline, so it only pairs against a local clone)
+            if not args.no_test_pairing:
+                print("\n🧪 Checking source changes for matching test changes...")
+                try:
+                    untested = untested_changes(release, client=None if args.source == 'snapshot' else github,
+                                                repo_path=local_path, cache_dir=args.test_pairing_cache)
+                    if untested is None:
+                        print("   ⚠️  Skipping test pairing: no repository tree available offline")
+                    else:
+                        print(f"   ⚠️  {len(untested)} changed source files without test changes")
+                        trailing += render_untested_lines(untested)
+                except (requests.RequestException, subprocess.CalledProcessError, ValueError, DeadlineExceeded) as e:
+                    print(f"   ⚠️  Skipping test pairing: {e}")
+            
+            # Files usually changed together, where only one side changed this release
+            if local_path and not args.no_cochange:
+                print("\n🔗 Checking usual partner files...")
+                try:
+                    matrix = CoChangeMatrix.for_repo(args.cochange_dir, owner, repo)
+                    added = matrix.update_from_git(local_path, head)
+                    if added:
+                        matrix.save()
+                        print(f"   ✅ Added {added} commits to the co-change matrix ({len(matrix.names)} files)")
+                    ignore = None
+                    if path_classifier:
+                        ignore = lambda path: path_classifier.classify(path) in LOW_SIGNAL_CLASSES
+                    present = tracked_files(local_path, resolve_ref(local_path, head))
+                    missing_partners = find_missing_partners([change.filename for change in release.files], matrix,
+                                                             present, ignore)
+                    print(f"   ⚠️  {len(missing_partners)} usual partner files left unchanged")
+                    trailing += render_missing_partner_lines(missing_partners)
+                except (subprocess.CalledProcessError, ValueError) as e:
+                    print(f"   ⚠️  Skipping co-change check: {e}")
+            return leading, trailing
+        
+
+        if args.source == 'snapshot':
+            print(f"\n📥 STEP 2: Loading release snapshot {snapshot}...")
+            saved = load_release(snapshot)
+            if saved is None:
+                raise FileNotFoundError(f"No usable release snapshot at {snapshot}")
+            print(f"   ✅ Loaded {len(saved.commits)} commits and {len(saved.files)} files")
+            release = saved
+            changelog_data = fetch_changelog_from_snapshot(saved, enricher, args.patch_budget_tokens, args.patch_files,
+                                                           commit_store=commit_store, path_classifier=path_classifier,
+                                                           churn_trie=churn_trie,
+                                                           changelog_budget=args.changelog_budget_tokens,
+                                                           ticket_groups=ticket_groups,
+                                                           ticket_prefixes=args.ticket_prefixes, hotspots=hotspots,
+                                                           extra_sections=release_sections)
+        elif local_path:
+            print(f"\n📥 STEP 2: Building changelog from local git...")
+            changelog_data = fetch_changelog_from_local(local_path, owner, repo, base, head, enricher,
+                                                        args.patch_budget_tokens, args.patch_files,
+                                                        commit_store=commit_store,
+                                                        dedupe_cherry_picks=args.dedupe_cherry_picks,
+                                                        path_classifier=path_classifier, churn_trie=churn_trie,
+                                                        changelog_budget=args.changelog_budget_tokens,
+                                                        ticket_groups=ticket_groups,
+                                                        ticket_prefixes=args.ticket_prefixes,
+                                                        release=release, hotspots=hotspots,
+                                                        deadline_notes=deadline_notes, extra_sections=release_sections)
+        else:
+            print(f"\n📥 STEP 2: Fetching changelog from GitHub API...")
+            changelog_data = fetch_changelog_from_github(github, owner, repo, base, head, enricher, engine,
+                                                         args.patch_budget_tokens, args.patch_files,
+                                                         stream_json=args.stream_json, commit_store=commit_store,
+                                                         dedupe_cherry_picks=args.dedupe_cherry_picks,
+                                                         path_classifier=path_classifier, churn_trie=churn_trie,
+                                                         changelog_budget=args.changelog_budget_tokens,
+                                                         ticket_groups=ticket_groups,
+                                                         ticket_prefixes=args.ticket_prefixes,
+                                                         release=release, hotspots=hotspots,
+                                                         deadline_notes=deadline_notes, extra_sections=release_sections)
+        if deadline_notes:
+            print("   ⏱️  Fetch was cut short: not saving a release snapshot or recording hotspot history")
+        elif args.source != 'snapshot' and not args.no_snapshot:
+            size = save_release(release, snapshot)
+            print(f"   💾 Saved release snapshot to {snapshot} ({size / 1024:.0f} KB)")
         
         # Send to Claude
         print("\n🤖 STEP 3: Sending to Claude for analysis...")
@@ -489,17 +1222,41 @@ def main():
         print(f"   Other Changes: {len(data['otherChanges'])}")
         print(f"   Summary bullets: {len(data['summary'])}")
         
+        # Tickets Claude names should all come from the changelog
+        if ticket_groups:
+            invented = unknown_tickets(claude_response, set(ticket_groups), args.ticket_prefixes)
+            if invented:
+                print(f"   ⚠️  Claude mentioned tickets not in this release: {', '.join(invented)}")
+        
         if len(data['p0Items']) == 0:
             print("\n⚠️  WARNING: No P0 items found in Claude's response!")
             print("   Check claude_reports/report_{report_date}.md to see what Claude said")
         
+        # Fold this release's churn and P0 items into the hotspot history (complete releases only)
+        if hotspots is not None and not deadline_notes:
+            p0_texts = p0_item_texts(data['p0Items'], ticket_groups)
+            if hotspots.record_release(f"{base}...{head}", release.files, churn_trie.module_of, p0_texts):
+                hotspots.save()
+                print(f"   🔥 Recorded {len(release.files)} files into the hotspot index ({hotspots.path})")
+            else:
+                print(f"   🔥 {base}...{head} is already in the hotspot index")
+        
         # Update dashboard
         print("\n📝 STEP 4: Updating main dashboard...")
         update_main_dashboard(data, version, week_of, report_date)
+        previous_dashboard = None
         
         # Create report page
         print("\n📄 STEP 5: Creating new report page...")
-        create_report_page(claude_response, data, version, week_of, report_date)
+        extra_sections = [
+            ('🧮', 'Heuristic Pre-Score', render_prescore_html(ranked, preliminary_level)),
+            ('📦', 'Churn by Module', render_churn_html(churn_trie.rollup())),
+        ]
+        if untested is not None:
+            extra_sections.append(('🧪', 'Source Changes Without Test Changes', render_untested_html(untested)))
+        if missing_partners is not None:
+            extra_sections.append(('🔗', 'Usual Partners Not Changed', render_missing_partner_html(missing_partners)))
+        create_report_page(claude_response, data, version, week_of, report_date, extra_sections)
         
         # Show what to do next
         if args.skip_git:
@@ -515,7 +1272,6 @@ def main():
             print(f"   git commit -m 'Weekly update: {week_of} - Android RC {version}'")
             print("   git push")
         else:
-            import subprocess
             print("\n📤 Committing and pushing to GitHub...")
             subprocess.run(['git', 'add', 'index.html', f'reports/{report_date}.html', f'claude_reports/report_{report_date}.md'], check=True)
             subprocess.run(['git', 'commit', '-m', f'Weekly update: {week_of} - Android RC {version}'], check=True)
@@ -535,10 +1291,22 @@ def main():
         
     except Exception as e:
         print(f"\n❌ ERROR: {e}")
+        if previous_dashboard is not None:
+            Path('index.html').write_text(previous_dashboard)
+            print("   ↩️  Restored index.html to its state before the preliminary update")
         import traceback
         traceback.print_exc()
         return 1
     
+    finally:
+        github.print_stats()
+        github.close()
+        claude_stats = claude_flights.stats()
+        if claude_stats['calls']:
+            print(f"   Claude calls: {claude_stats['calls']} requested, {claude_stats['shared']} coalesced")
+        if commit_store is not None:
+            commit_store.close()
+    
     return 0
 
 